@@ -1,27 +1,43 @@
 import sqlite3
+import atexit
 import curses
 import curses.textpad # For multiline input
 import re
 import os
 import argparse
+import itertools
+from contextlib import contextmanager
+from functools import lru_cache, wraps
 from datetime import datetime
+from pathlib import Path
 
 # Configuration file path
 CONFIG_FILE = os.path.expanduser('~/.journalrc')
 
+# Parsed settings, loaded from CONFIG_FILE on first use
+_CONFIG_CACHE = None
+
+def _load_config():
+    """Parses the config file into a dict once and returns it."""
+    global _CONFIG_CACHE
+    if _CONFIG_CACHE is None:
+        _CONFIG_CACHE = {}
+        if os.path.isfile(CONFIG_FILE):
+            with open(CONFIG_FILE, 'r') as f:
+                for line in f:
+                    key, sep, value = line.strip().partition('=')
+                    if sep:
+                        # The first setting of a key wins, as when the file was scanned per lookup
+                        _CONFIG_CACHE.setdefault(key, value.strip().strip('"').strip("'"))
+    return _CONFIG_CACHE
+
 def get_config_value(key, default=None):
     """Read a value from the config file."""
-    if os.path.isfile(CONFIG_FILE):
-        with open(CONFIG_FILE, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line.startswith(f'{key}='):
-                    value = line.split('=', 1)[1].strip().strip('"').strip("'")
-                    return value
-    return default
+    return _load_config().get(key, default)
 
 def set_config_value(key, value):
     """Set a value in the config file, preserving other settings."""
+    _load_config()[key] = str(value)
     lines = []
     key_found = False
 
@@ -68,9 +84,12 @@ DATABASE_NAME = get_database_path()
 # Theme mode: True = dark mode (light text on dark bg), False = light mode (dark text on light bg)
 dark_mode = load_theme_preference()
 
+# Color attributes, combined once by init_colors() instead of per drawn row or line
+_SELECTED_ATTR = _HEADER_ATTR = _CODE_ATTR = _TAG_ATTR = _LIST_MARKER_ATTR = _BACKGROUND_ATTR = curses.A_NORMAL
+
 def init_colors():
     """Initialize color pairs based on current theme mode."""
-    global dark_mode
+    global dark_mode, _SELECTED_ATTR, _HEADER_ATTR, _CODE_ATTR, _TAG_ATTR, _LIST_MARKER_ATTR, _BACKGROUND_ATTR
     curses.start_color()
 
     if dark_mode:
@@ -90,13 +109,20 @@ def init_colors():
         curses.init_pair(5, curses.COLOR_MAGENTA, curses.COLOR_WHITE) # List markers/tags
         curses.init_pair(6, curses.COLOR_BLACK, curses.COLOR_WHITE)  # Default background
 
+    _SELECTED_ATTR = curses.color_pair(1)
+    _HEADER_ATTR = curses.color_pair(3) | curses.A_BOLD
+    _CODE_ATTR = curses.color_pair(4)
+    _TAG_ATTR = curses.color_pair(5)
+    _LIST_MARKER_ATTR = _TAG_ATTR | curses.A_BOLD
+    _BACKGROUND_ATTR = curses.color_pair(6)
+
 def toggle_theme(stdscr):
     """Toggle between dark and light mode and save preference."""
     global dark_mode
     dark_mode = not dark_mode
     init_colors()
     # Apply background color
-    stdscr.bkgd(' ', curses.color_pair(6))
+    stdscr.bkgd(' ', _BACKGROUND_ATTR)
     # Save preference to config file
     set_config_value('THEME', 'dark' if dark_mode else 'light')
     # Force screen refresh
@@ -105,24 +131,224 @@ def toggle_theme(stdscr):
 
 # --- Database Functions ---
 
+# Shared connection, opened once by init_db() and reused by every helper
+_CONN = None
+# Read-only connection for the list/view queries, so reads never take the write path
+_RO_CONN = None
+# PRAGMA data_version of the read-only connection when the read caches were last valid
+_DATA_VERSION = None
+# Set by init_db() when SQLite has FTS5 and the entries_fts index exists
+_FTS_ENABLED = False
+# The trigram tokenizer (SQLite 3.34+) indexes every substring, so MATCH finds
+# what LIKE '%term%' would; older builds index whole words instead
+_FTS_TRIGRAM = sqlite3.sqlite_version_info >= (3, 34, 0)
+_FTS_TOKENIZER = 'trigram' if _FTS_TRIGRAM else 'unicode61 remove_diacritics 2'
+
+# SQL text is kept constant so the connection's statement cache can reuse
+# the compiled statements across calls
+_SQL_INSERT = "INSERT INTO entries (title, content) VALUES (?, ?)"
+_SQL_SELECT_ALL = "SELECT id, formatted_time, title FROM entries ORDER BY timestamp DESC"
+_SQL_SELECT_PAGE = "SELECT id, formatted_time, title FROM entries ORDER BY timestamp DESC LIMIT ? OFFSET ?"
+_SQL_COUNT = "SELECT COUNT(*) FROM entries"
+_SQL_SELECT_ONE = "SELECT id, formatted_time, title, content FROM entries WHERE id = ?"
+_SQL_TAG_LIST = """(SELECT group_concat(name, ',') FROM (
+        SELECT t.name FROM entry_tags et
+        JOIN tags t ON t.id = et.tag_id
+        WHERE et.entry_id = e.id
+        ORDER BY t.name)) AS tags"""
+_SQL_SELECT_ONE_WITH_TAGS = f"""
+    SELECT e.id, e.formatted_time, e.title, e.content, {_SQL_TAG_LIST}
+    FROM entries e
+    WHERE e.id = ?
+"""
+_SQL_EXPORT = f"""
+    SELECT e.id, e.formatted_time, e.title, e.content, {_SQL_TAG_LIST}
+    FROM entries e
+    ORDER BY e.timestamp DESC
+"""
+_SQL_UPDATE = "UPDATE entries SET title = ?, content = ? WHERE id = ?"
+_SQL_DELETE = "DELETE FROM entries WHERE id = ?"
+_SQL_DELETE_TAG_LINKS = "DELETE FROM entry_tags WHERE entry_id = ?"
+_SQL_SELECT_TAG_ID = "SELECT id FROM tags WHERE name = ?"
+_SQL_CREATE_TAG = "INSERT INTO tags (name) VALUES (?)"
+_SQL_INSERT_TAG = "INSERT OR IGNORE INTO tags (name) VALUES (?)"
+_SQL_INSERT_TAG_LINK = "INSERT OR IGNORE INTO entry_tags (entry_id, tag_id) SELECT ?, id FROM tags WHERE name = ?"
+_SQL_ENTRY_TAGS = """
+    SELECT t.name FROM tags t
+    JOIN entry_tags et ON t.id = et.tag_id
+    WHERE et.entry_id = ?
+    ORDER BY t.name
+"""
+_SQL_ALL_TAGS = """
+    SELECT t.name, COUNT(et.entry_id) as count
+    FROM tags t
+    LEFT JOIN entry_tags et ON t.id = et.tag_id
+    GROUP BY t.id
+    ORDER BY t.name
+"""
+_SQL_ENTRIES_BY_TAG = """
+    SELECT e.id, e.formatted_time, e.title
+    FROM entries e
+    JOIN entry_tags et ON e.id = et.entry_id
+    JOIN tags t ON et.tag_id = t.id
+    WHERE t.name = ?
+    ORDER BY e.timestamp DESC
+"""
+_SQL_SEARCH_FTS = """
+    SELECT e.id, e.formatted_time, e.title
+    FROM entries e
+    WHERE e.id IN (SELECT rowid FROM entries_fts WHERE entries_fts MATCH ?)
+       OR e.id IN (SELECT et.entry_id FROM entry_tags et
+                   JOIN tags t ON et.tag_id = t.id
+                   WHERE t.name LIKE ?)
+    ORDER BY e.timestamp DESC
+"""
+_SQL_SEARCH_LIKE = """
+    SELECT DISTINCT e.id, e.formatted_time, e.title
+    FROM entries e
+    LEFT JOIN entry_tags et ON e.id = et.entry_id
+    LEFT JOIN tags t ON et.tag_id = t.id
+    WHERE e.title LIKE ? OR e.content LIKE ? OR t.name LIKE ?
+    ORDER BY e.timestamp DESC
+"""
+
+def _get_conn():
+    """Returns the shared database connection, opening it on first use."""
+    global _CONN
+    if _CONN is None:
+        _CONN = sqlite3.connect(DATABASE_NAME, isolation_level=None, check_same_thread=False,
+                                cached_statements=128)
+        _CONN.row_factory = sqlite3.Row # Rows index like tuples and also by column name
+        # Tuned once per connection, so helpers that open it lazily get the same settings
+        try:
+            _CONN.execute("PRAGMA journal_mode=WAL")
+        except sqlite3.OperationalError:
+            pass # Some network filesystems can't do WAL; keep the default rollback journal
+        _CONN.execute("PRAGMA synchronous=NORMAL")
+        _CONN.execute("PRAGMA temp_store=MEMORY")
+        _CONN.execute("PRAGMA cache_size=-20000")
+        _CONN.execute("PRAGMA mmap_size=268435456")
+        _CONN.execute("PRAGMA busy_timeout=5000")
+        _CONN.execute("PRAGMA foreign_keys=ON") # Lets ON DELETE CASCADE clean up tag links
+    return _CONN
+
+def _get_ro_conn():
+    """Returns the shared read-only connection, opening it on first use."""
+    global _RO_CONN
+    if DATABASE_NAME == ':memory:':
+        return _get_conn() # A private in-memory database can't be opened twice
+    if _RO_CONN is None:
+        _get_conn() # Make sure the database file exists before opening it read-only
+        uri = f"{Path(DATABASE_NAME).resolve().as_uri()}?mode=ro"
+        _RO_CONN = sqlite3.connect(uri, uri=True, isolation_level=None, check_same_thread=False,
+                                   cached_statements=128)
+        _RO_CONN.row_factory = sqlite3.Row
+        _RO_CONN.execute("PRAGMA query_only=1")
+        _RO_CONN.execute("PRAGMA temp_store=MEMORY")
+        _RO_CONN.execute("PRAGMA cache_size=-20000")
+        _RO_CONN.execute("PRAGMA mmap_size=268435456")
+        _RO_CONN.execute("PRAGMA busy_timeout=5000")
+    return _RO_CONN
+
+def close_db():
+    """Closes the shared database connections if they are open."""
+    global _CONN, _RO_CONN, _DATA_VERSION
+    if _RO_CONN is not None:
+        _RO_CONN.close()
+        _RO_CONN = None
+        _DATA_VERSION = None # A new connection counts versions afresh
+    if _CONN is not None:
+        _CONN.close()
+        _CONN = None
+
+atexit.register(close_db)
+
+def _check_data_version():
+    """
+    Drops the cached reads if the database has changed since they were made.
+    data_version moves whenever another connection commits, which covers
+    writes from this process's own write connection and from other processes
+    (journal.py --add, a synced copy of the file) alike.
+    """
+    global _DATA_VERSION
+    version = _get_ro_conn().execute("PRAGMA data_version").fetchone()[0]
+    if version != _DATA_VERSION:
+        _DATA_VERSION = version
+        _clear_entry_caches()
+
+def _cached_read(maxsize):
+    """Like lru_cache, but checks the database's data_version before serving a result."""
+    def decorate(func):
+        cached = lru_cache(maxsize=maxsize)(func)
+
+        @wraps(func)
+        def wrapper(*args):
+            _check_data_version()
+            return cached(*args)
+        wrapper.cache_clear = cached.cache_clear
+        return wrapper
+    return decorate
+
+@contextmanager
+def _transaction():
+    """Runs the enclosed statements in a single transaction on the shared connection."""
+    conn = _get_conn()
+    conn.execute("BEGIN IMMEDIATE") # Take the write lock up front instead of upgrading mid-transaction
+    try:
+        yield conn
+        conn.execute("COMMIT")
+    except BaseException:
+        # Also reached when COMMIT itself fails (e.g. SQLITE_BUSY), which would
+        # otherwise leave the shared connection stuck inside the transaction
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+
 def init_db():
     """Initializes the database and creates tables if they don't exist."""
-    conn = sqlite3.connect(DATABASE_NAME)
-    cursor = conn.cursor()
+    global _FTS_ENABLED
+    close_db()  # Reopen in case DATABASE_NAME changed
+    _clear_entry_caches()
+    cursor = _get_conn().cursor()
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS entries (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
             title TEXT NOT NULL,
-            content TEXT NOT NULL
+            content TEXT NOT NULL,
+            formatted_time TEXT
         )
     ''')
+    # The display timestamp is stored when an entry is written instead of
+    # running strftime() over every row of every list query
+    columns = [row['name'] for row in cursor.execute("PRAGMA table_info(entries)")]
+    if "formatted_time" not in columns:
+        cursor.execute("ALTER TABLE entries ADD COLUMN formatted_time TEXT")
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS entries_formatted_time_ai AFTER INSERT ON entries
+        BEGIN
+            UPDATE entries SET formatted_time = strftime('%Y-%m-%d %H:%M', NEW.timestamp) WHERE id = NEW.id;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS entries_formatted_time_au AFTER UPDATE OF timestamp ON entries
+        BEGIN
+            UPDATE entries SET formatted_time = strftime('%Y-%m-%d %H:%M', NEW.timestamp) WHERE id = NEW.id;
+        END
+    ''')
+    cursor.execute("UPDATE entries SET formatted_time = strftime('%Y-%m-%d %H:%M', timestamp) WHERE formatted_time IS NULL")
+    # Lets ORDER BY timestamp DESC walk the index instead of sorting the table.
+    # It also carries the list columns, so a page (and the rows its OFFSET skips)
+    # is read from the index alone; it supersedes the plain timestamp index
+    cursor.execute("DROP INDEX IF EXISTS idx_entries_ts_desc")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_entries_list ON entries(timestamp DESC, id, formatted_time, title)")
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS tags (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL UNIQUE
+            name TEXT NOT NULL UNIQUE COLLATE NOCASE
         )
     ''')
+    _migrate_tags_nocase(cursor)
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS entry_tags (
             entry_id INTEGER NOT NULL,
@@ -132,170 +358,303 @@ def init_db():
             FOREIGN KEY (tag_id) REFERENCES tags(id) ON DELETE CASCADE
         )
     ''')
-    conn.commit()
-    conn.close()
+    # The primary key only serves lookups by entry; this covers joins from a tag
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_entry_tags_tag ON entry_tags(tag_id, entry_id)")
+    _FTS_ENABLED = _init_fts(cursor)
+    # Refreshes planner statistics only when they look stale, so startup stays cheap
+    cursor.execute("PRAGMA optimize")
+
+def _migrate_tags_nocase(cursor):
+    """Rebuilds a tags table created before tag names compared case-insensitively."""
+    cursor.execute("SELECT sql FROM sqlite_master WHERE name = 'tags'")
+    if "NOCASE" in cursor.fetchone()[0].upper():
+        return
+    # Dropping the old table would otherwise cascade into entry_tags
+    cursor.execute("PRAGMA foreign_keys=OFF")
+    try:
+        with _transaction():
+            cursor.execute('''
+                CREATE TABLE tags_nocase (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL UNIQUE COLLATE NOCASE
+                )
+            ''')
+            cursor.execute("INSERT OR IGNORE INTO tags_nocase (id, name) SELECT id, lower(name) FROM tags ORDER BY id")
+            # Names differing only by case collapse onto the lowest id; move their
+            # links there, then drop the links the entry already had to that id
+            cursor.execute('''
+                UPDATE OR IGNORE entry_tags
+                SET tag_id = (SELECT n.id FROM tags_nocase n
+                              WHERE n.name = (SELECT t.name FROM tags t WHERE t.id = entry_tags.tag_id))
+                WHERE tag_id NOT IN (SELECT id FROM tags_nocase)
+            ''')
+            cursor.execute("DELETE FROM entry_tags WHERE tag_id NOT IN (SELECT id FROM tags_nocase)")
+            cursor.execute("DROP TABLE tags")
+            cursor.execute("ALTER TABLE tags_nocase RENAME TO tags")
+    finally:
+        cursor.execute("PRAGMA foreign_keys=ON")
+
+def _init_fts(cursor):
+    """Creates the full-text index over entries and its sync triggers. Returns False if FTS5 is unavailable."""
+    cursor.execute("SELECT sql FROM sqlite_master WHERE name = 'entries_fts'")
+    row = cursor.fetchone()
+    exists = row is not None
+    if exists and _FTS_TOKENIZER not in row[0]:
+        # Built with another tokenizer; recreate it and index the entries again
+        cursor.execute("DROP TABLE entries_fts")
+        exists = False
+    try:
+        cursor.execute(f'''
+            CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+                title, content, content='entries', content_rowid='id',
+                tokenize='{_FTS_TOKENIZER}'
+            )
+        ''')
+    except sqlite3.OperationalError:
+        return False # SQLite built without FTS5, search falls back to LIKE
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS entries_fts_ai AFTER INSERT ON entries
+        BEGIN
+            INSERT INTO entries_fts(rowid, title, content) VALUES (NEW.id, NEW.title, NEW.content);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS entries_fts_ad AFTER DELETE ON entries
+        BEGIN
+            INSERT INTO entries_fts(entries_fts, rowid, title, content) VALUES ('delete', OLD.id, OLD.title, OLD.content);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS entries_fts_au AFTER UPDATE OF title, content ON entries
+        BEGIN
+            INSERT INTO entries_fts(entries_fts, rowid, title, content) VALUES ('delete', OLD.id, OLD.title, OLD.content);
+            INSERT INTO entries_fts(rowid, title, content) VALUES (NEW.id, NEW.title, NEW.content);
+        END
+    ''')
+    if not exists:
+        # Index entries written before the full-text table existed
+        cursor.execute("INSERT INTO entries_fts(entries_fts) VALUES ('rebuild')")
+    return True
 
-def add_entry_db(title, content):
-    """Adds a new journal entry to the database. Returns entry_id on success, None on failure."""
-    conn = sqlite3.connect(DATABASE_NAME)
-    cursor = conn.cursor()
+def add_entry_db(title, content, tags=None):
+    """
+    Adds a new journal entry to the database, with tags if given, in a single
+    transaction. Returns entry_id on success, None on failure.
+    """
+    if not tags:
+        cursor = _get_conn().cursor()
+        try:
+            cursor.execute(_SQL_INSERT, (title, content))
+            _clear_entry_caches()
+            return cursor.lastrowid
+        except sqlite3.Error as e:
+            return None
+
+    names = _normalize_tags(tags)
     try:
-        cursor.execute("INSERT INTO entries (title, content) VALUES (?, ?)", (title, content))
-        conn.commit()
-        return cursor.lastrowid
-    except sqlite3.Error as e:
+        with _transaction() as conn:
+            entry_id = conn.execute(_SQL_INSERT, (title, content)).lastrowid
+            conn.executemany(_SQL_INSERT_TAG, [(name,) for name in names])
+            conn.executemany(_SQL_INSERT_TAG_LINK, [(entry_id, name) for name in names])
+        _clear_entry_caches()
+        return entry_id
+    except sqlite3.Error:
         return None
-    finally:
-        conn.close()
+
+def add_entries_bulk_db(pairs, tags=None):
+    """
+    Adds many (title, content) entries in one transaction. If tags is given,
+    tags[i] is the list of tag names for pairs[i]. Returns True on success.
+    """
+    if tags is not None and len(tags) != len(pairs):
+        return False # zip() would silently drop the entries without tags
+    try:
+        with _transaction() as conn:
+            if tags is None:
+                conn.executemany(_SQL_INSERT, pairs)
+            else:
+                # Each insert's rowid is needed for its links, so entries go in one
+                # at a time; the tags and links still go in as single batches
+                links = []
+                for (title, content), tag_names in zip(pairs, tags):
+                    entry_id = conn.execute(_SQL_INSERT, (title, content)).lastrowid
+                    links.extend((entry_id, name) for name in _normalize_tags(tag_names))
+                conn.executemany(_SQL_INSERT_TAG, [(name,) for _, name in links])
+                conn.executemany(_SQL_INSERT_TAG_LINK, links)
+        _clear_entry_caches()
+        return True
+    except sqlite3.Error:
+        return False
 
 def get_all_entries_db():
     """Retrieves all journal entries from the database, ordered by timestamp."""
-    conn = sqlite3.connect(DATABASE_NAME)
-    cursor = conn.cursor()
+    cursor = _get_ro_conn().cursor()
     # Fetching id, formatted timestamp, and title for the list view
-    cursor.execute("SELECT id, strftime('%Y-%m-%d %H:%M', timestamp) AS formatted_time, title FROM entries ORDER BY timestamp DESC")
-    entries = cursor.fetchall()
-    conn.close()
-    return entries
-
+    cursor.execute(_SQL_SELECT_ALL)
+    return cursor.fetchall()
+
+@_cached_read(maxsize=8) # Flipping back to a page seen since the last write skips the query
+def get_entries_page_db(offset, limit):
+    """Retrieves one page of journal entries, ordered by timestamp."""
+    cursor = _get_ro_conn().cursor()
+    cursor.execute(_SQL_SELECT_PAGE, (limit, offset))
+    return cursor.fetchall()
+
+@_cached_read(maxsize=1) # Cleared whenever entries are added or deleted
+def count_entries_db():
+    """Returns the total number of journal entries."""
+    cursor = _get_ro_conn().cursor()
+    cursor.execute(_SQL_COUNT)
+    return cursor.fetchone()[0]
+
+@_cached_read(maxsize=32) # Cleared by every helper that writes entries
 def get_entry_db(entry_id):
     """Retrieves a specific journal entry by its ID."""
-    conn = sqlite3.connect(DATABASE_NAME)
-    cursor = conn.cursor()
+    cursor = _get_ro_conn().cursor()
     # Fetching id, formatted timestamp, title, and content for the detailed view
-    cursor.execute("SELECT id, strftime('%Y-%m-%d %H:%M', timestamp) AS formatted_time, title, content FROM entries WHERE id = ?", (entry_id,))
+    cursor.execute(_SQL_SELECT_ONE, (entry_id,))
+    return cursor.fetchone()
+
+@_cached_read(maxsize=32) # Cleared by every helper that writes entries or tags
+def get_entry_with_tags_db(entry_id):
+    """
+    Retrieves an entry like get_entry_db, plus its tags in one query.
+    Returns (entry, tag_names), or (None, []) if there is no such entry.
+    """
+    cursor = _get_ro_conn().cursor()
+    cursor.execute(_SQL_SELECT_ONE_WITH_TAGS, (entry_id,))
     entry = cursor.fetchone()
-    conn.close()
-    return entry
+    if entry is None:
+        return None, []
+    # Tag names can't contain commas; the tag prompt splits on them
+    return entry, entry['tags'].split(',') if entry['tags'] else []
+
+def iter_entries_with_tags_db():
+    """
+    Yields (entry, tag_names) for every entry, newest first, from a single
+    query rather than a lookup per entry.
+    """
+    cursor = _get_ro_conn().cursor()
+    for entry in cursor.execute(_SQL_EXPORT):
+        yield entry, entry['tags'].split(',') if entry['tags'] else []
 
 def delete_entry_db(entry_id):
-    """Deletes a journal entry by its ID."""
-    conn = sqlite3.connect(DATABASE_NAME)
-    cursor = conn.cursor()
+    """Deletes a journal entry and its tag links by its ID."""
     try:
-        cursor.execute("DELETE FROM entries WHERE id = ?", (entry_id,))
-        conn.commit()
+        with _transaction() as conn:
+            conn.execute(_SQL_DELETE, (entry_id,)) # Tag links go with it via ON DELETE CASCADE
+        _clear_entry_caches()
         return True
     except sqlite3.Error as e:
         return False
-    finally:
-        conn.close()
+
+def _clear_entry_caches():
+    """Drops cached entry lookups, lists, searches and the entry count after a write."""
+    get_entry_db.cache_clear()
+    get_entry_with_tags_db.cache_clear()
+    get_entries_page_db.cache_clear()
+    count_entries_db.cache_clear()
+    search_entries_db.cache_clear()
 
 def update_entry_db(entry_id, title, content):
     """Updates an existing journal entry."""
-    conn = sqlite3.connect(DATABASE_NAME)
-    cursor = conn.cursor()
+    cursor = _get_conn().cursor()
     try:
-        cursor.execute("UPDATE entries SET title = ?, content = ? WHERE id = ?", (title, content, entry_id))
-        conn.commit()
+        cursor.execute(_SQL_UPDATE, (title, content, entry_id))
+        _clear_entry_caches()
         return cursor.rowcount > 0
     except sqlite3.Error as e:
         return False
-    finally:
-        conn.close()
 
+@_cached_read(maxsize=32) # Repeated searches are served from memory until the next write
 def search_entries_db(search_term):
     """Searches journal entries by title, content, or tag."""
-    conn = sqlite3.connect(DATABASE_NAME)
-    cursor = conn.cursor()
+    cursor = _get_conn().cursor()
     search_pattern = f"%{search_term}%"
-    cursor.execute("""
-        SELECT DISTINCT e.id, strftime('%Y-%m-%d %H:%M', e.timestamp) AS formatted_time, e.title
-        FROM entries e
-        LEFT JOIN entry_tags et ON e.id = et.entry_id
-        LEFT JOIN tags t ON et.tag_id = t.id
-        WHERE e.title LIKE ? OR e.content LIKE ? OR t.name LIKE ?
-        ORDER BY e.timestamp DESC
-    """, (search_pattern, search_pattern, search_pattern))
-    entries = cursor.fetchall()
-    conn.close()
-    return entries
+    # Trigrams can't match a term shorter than three characters, and the word
+    # tokenizer drops punctuation, so those terms are left to LIKE
+    if _FTS_TRIGRAM:
+        use_fts = len(search_term) >= 3
+    else:
+        use_fts = any(c.isalnum() for c in search_term)
+    if _FTS_ENABLED and use_fts:
+        # Quoted as one phrase so punctuation in the term isn't parsed as FTS syntax;
+        # with words rather than trigrams, the trailing * makes the last word a prefix match
+        match_term = '"' + search_term.replace('"', '""') + ('"' if _FTS_TRIGRAM else '"*')
+        try:
+            cursor.execute(_SQL_SEARCH_FTS, (match_term, search_pattern))
+            return cursor.fetchall()
+        except sqlite3.OperationalError:
+            pass # Unusable index or MATCH syntax; fall back to the plain scan
+    cursor.execute(_SQL_SEARCH_LIKE, (search_pattern, search_pattern, search_pattern))
+    return cursor.fetchall()
 
 # --- Tag Database Functions ---
 
 def get_or_create_tag(tag_name):
     """Gets a tag by name or creates it if it doesn't exist. Returns tag_id."""
-    conn = sqlite3.connect(DATABASE_NAME)
-    cursor = conn.cursor()
+    cursor = _get_conn().cursor()
     tag_name = tag_name.strip().lower()
-    try:
-        cursor.execute("SELECT id FROM tags WHERE name = ?", (tag_name,))
-        result = cursor.fetchone()
-        if result:
-            return result[0]
-        cursor.execute("INSERT INTO tags (name) VALUES (?)", (tag_name,))
-        conn.commit()
-        return cursor.lastrowid
-    finally:
-        conn.close()
+    cursor.execute(_SQL_SELECT_TAG_ID, (tag_name,))
+    result = cursor.fetchone()
+    if result:
+        return result['id']
+    cursor.execute(_SQL_CREATE_TAG, (tag_name,))
+    return cursor.lastrowid
+
+def _normalize_tags(tag_names):
+    """Lowercases and strips tag names, dropping blanks and repeats."""
+    return list(dict.fromkeys(name for name in (t.strip().lower() for t in tag_names) if name))
 
 def set_entry_tags(entry_id, tag_names):
     """Sets tags for an entry (replaces existing tags)."""
-    conn = sqlite3.connect(DATABASE_NAME)
-    cursor = conn.cursor()
+    names = _normalize_tags(tag_names) # So each tag is written once
     try:
-        # Remove existing tags
-        cursor.execute("DELETE FROM entry_tags WHERE entry_id = ?", (entry_id,))
-        conn.commit()
-
-        # Add new tags (each in its own transaction to avoid lock with get_or_create_tag)
-        for tag_name in tag_names:
-            tag_name = tag_name.strip().lower()
-            if tag_name:
-                tag_id = get_or_create_tag(tag_name)
-                cursor.execute("INSERT OR IGNORE INTO entry_tags (entry_id, tag_id) VALUES (?, ?)",
-                             (entry_id, tag_id))
-                conn.commit()
+        with _transaction() as conn:
+            conn.execute(_SQL_DELETE_TAG_LINKS, (entry_id,))
+            conn.executemany(_SQL_INSERT_TAG, [(name,) for name in names])
+            conn.executemany(_SQL_INSERT_TAG_LINK, [(entry_id, name) for name in names])
         return True
     except sqlite3.Error:
         return False
     finally:
-        conn.close()
+        search_entries_db.cache_clear() # Search results include tag matches
+        get_entry_with_tags_db.cache_clear()
 
 def get_entry_tags(entry_id):
     """Gets all tags for an entry."""
-    conn = sqlite3.connect(DATABASE_NAME)
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT t.name FROM tags t
-        JOIN entry_tags et ON t.id = et.tag_id
-        WHERE et.entry_id = ?
+    cursor = _get_conn().cursor()
+    cursor.execute(_SQL_ENTRY_TAGS, (entry_id,))
+    return [row['name'] for row in cursor.fetchall()]
+
+def get_tags_for_entries_db(entry_ids):
+    """Gets the tags for several entries in one query. Returns {entry_id: [tag names]}."""
+    tags_by_entry = {entry_id: [] for entry_id in entry_ids}
+    if not tags_by_entry:
+        return tags_by_entry
+    placeholders = ", ".join("?" * len(tags_by_entry))
+    cursor = _get_conn().cursor()
+    cursor.execute(f"""
+        SELECT et.entry_id, t.name FROM entry_tags et
+        JOIN tags t ON t.id = et.tag_id
+        WHERE et.entry_id IN ({placeholders})
         ORDER BY t.name
-    """, (entry_id,))
-    tags = [row[0] for row in cursor.fetchall()]
-    conn.close()
-    return tags
+    """, tuple(tags_by_entry))
+    for entry_id, name in cursor.fetchall():
+        tags_by_entry[entry_id].append(name)
+    return tags_by_entry
 
 def get_all_tags():
     """Gets all tags with their entry counts."""
-    conn = sqlite3.connect(DATABASE_NAME)
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT t.name, COUNT(et.entry_id) as count
-        FROM tags t
-        LEFT JOIN entry_tags et ON t.id = et.tag_id
-        GROUP BY t.id
-        ORDER BY t.name
-    """)
-    tags = cursor.fetchall()
-    conn.close()
-    return tags
+    cursor = _get_conn().cursor()
+    cursor.execute(_SQL_ALL_TAGS)
+    return cursor.fetchall()
 
 def get_entries_by_tag(tag_name):
     """Gets all entries with a specific tag."""
-    conn = sqlite3.connect(DATABASE_NAME)
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT e.id, strftime('%Y-%m-%d %H:%M', e.timestamp) AS formatted_time, e.title
-        FROM entries e
-        JOIN entry_tags et ON e.id = et.entry_id
-        JOIN tags t ON et.tag_id = t.id
-        WHERE t.name = ?
-        ORDER BY e.timestamp DESC
-    """, (tag_name.lower(),))
-    entries = cursor.fetchall()
-    conn.close()
-    return entries
+    cursor = _get_conn().cursor()
+    cursor.execute(_SQL_ENTRIES_BY_TAG, (tag_name.strip(),)) # tags.name compares case-insensitively
+    return cursor.fetchall()
 
 # --- Curses UI Helper Functions ---
 
@@ -314,6 +673,23 @@ def display_message(stdscr, message, y_offset=None, x_offset=None, clear_first=T
     if wait_for_key:
         stdscr.getch()
 
+_input_win = None # Reused by get_text_input instead of allocating a window per field
+
+def _get_input_win(y, x, width):
+    """Returns the shared single-line input window, moved and sized to the given spot."""
+    global _input_win
+    width = max(min(width, curses.COLS - x), 1) # A window may not run past the right edge
+    if _input_win is not None:
+        try:
+            _input_win.resize(1, width)
+            _input_win.mvwin(y, x)
+            _input_win.erase()
+            return _input_win
+        except curses.error:
+            pass # Geometry ncurses won't move to; start over with a fresh window
+    _input_win = curses.newwin(1, width, y, x)
+    return _input_win
+
 def get_text_input(stdscr, prompt, y_offset, x_offset, max_len=60, clear_line_first=True):
     """Gets a single line of text input from the user."""
     if clear_line_first:
@@ -324,7 +700,7 @@ def get_text_input(stdscr, prompt, y_offset, x_offset, max_len=60, clear_line_fi
     stdscr.refresh()
     curses.echo() # Enable echoing of characters for input
     # Move cursor to after prompt
-    input_win = curses.newwin(1, max_len + 1, y_offset, x_offset + len(prompt))
+    input_win = _get_input_win(y_offset, x_offset + len(prompt), max_len + 1)
     input_str = input_win.getstr(0,0, max_len).decode(errors="ignore").strip()
     curses.noecho() # Disable echoing
     return input_str
@@ -333,29 +709,28 @@ def wrap_text(text, width):
     """Wrap text to fit within a given width, breaking at word boundaries."""
     if width <= 0:
         return []
-    words = text.split(' ')
+    if len(text) <= width and text[:1] != ' ':
+        return [text] # Fits as is; a leading space would still be dropped below
     lines = []
-    current_line = ""
-
-    for word in words:
-        # Handle words longer than width
-        while len(word) > width:
-            if current_line:
-                lines.append(current_line)
-                current_line = ""
-            lines.append(word[:width])
-            word = word[width:]
-
-        if not current_line:
-            current_line = word
-        elif len(current_line) + 1 + len(word) <= width:
-            current_line += " " + word
+    # Each line is cut at the last space that fits, found by a C-level rfind,
+    # instead of splitting the text into words and fitting them one by one
+    end = len(text)
+    start = 0
+    while True:
+        while start < end and text[start] == ' ':
+            start += 1 # Lines never start with the spaces they were broken at
+        if end - start <= width:
+            if start < end:
+                lines.append(text[start:])
+            break
+        cut = text.rfind(' ', start + 1, start + width + 1)
+        if cut < 0:
+            # Handle words longer than width
+            lines.append(text[start:start + width])
+            start += width
         else:
-            lines.append(current_line)
-            current_line = word
-
-    if current_line:
-        lines.append(current_line)
+            lines.append(text[start:cut])
+            start = cut + 1
 
     return lines if lines else [""]
 
@@ -381,7 +756,6 @@ def get_multiline_input(stdscr, prompt_message, title=None, initial_content=None
 
     stdscr.addstr(current_row, 0, prompt_message, curses.A_BOLD)
     stdscr.addstr(h - 2, 0, "Press Escape to Save | Ctrl+C to Cancel")
-    stdscr.refresh()
 
     # Editor area dimensions
     edit_y = current_row + 2
@@ -398,13 +772,17 @@ def get_multiline_input(stdscr, prompt_message, title=None, initial_content=None
         stdscr.attron(curses.color_pair(2))
         curses.textpad.rectangle(stdscr, edit_y - 1, edit_x - 1, edit_y + edit_h, edit_x + edit_w + 1)
         stdscr.attroff(curses.color_pair(2))
-        stdscr.refresh()
     except curses.error:
         pass
+    stdscr.noutrefresh()  # Flushed together with the first frame by redraw()
+
+    # Window over the inside of the border, and the text last drawn on each of its rows
+    edit_win = stdscr.derwin(edit_h, edit_w + 1, edit_y, edit_x)
+    drawn_rows = [None] * edit_h
 
     # Text buffer - list of lines (without word wrapping applied)
     if initial_content:
-        lines = initial_content.splitlines()
+        lines = split_content_lines(initial_content)
         if not lines:
             lines = [""]
         cursor_line = len(lines) - 1
@@ -417,39 +795,43 @@ def get_multiline_input(stdscr, prompt_message, title=None, initial_content=None
 
     curses.curs_set(1)  # Show cursor
 
+    wrap_cache = []  # (line_text, wrapped) per logical line, reused while the line is unchanged
+
+    def wrap_line(i):
+        """Return the wrapped segments of logical line i, rewrapping only if it changed."""
+        line = lines[i]
+        if i < len(wrap_cache):
+            cached_line, wrapped = wrap_cache[i]
+            if cached_line == line:
+                return wrapped
+        else:
+            wrap_cache.extend([(None, None)] * (i + 1 - len(wrap_cache)))
+        wrapped = wrap_text(line, edit_w) if line else [""]
+        wrap_cache[i] = (line, wrapped)
+        return wrapped
+
     def get_display_lines():
         """Convert logical lines to display lines with word wrapping."""
+        del wrap_cache[len(lines):]  # Drop entries for lines that were joined away
         display = []
         line_map = []  # Maps display line index to (logical_line, offset)
-        for i, line in enumerate(lines):
-            if not line:
-                display.append("")
-                line_map.append((i, 0))
-            else:
-                wrapped = wrap_text(line, edit_w)
-                for j, wline in enumerate(wrapped):
-                    display.append(wline)
-                    # Calculate character offset for this wrapped segment
-                    offset = sum(len(wrap_text(line, edit_w)[k]) + (1 if k > 0 else 0) for k in range(j))
-                    line_map.append((i, j))
+        for i in range(len(lines)):
+            for j, wline in enumerate(wrap_line(i)):
+                display.append(wline)
+                line_map.append((i, j))
         return display, line_map
 
     def get_cursor_display_pos():
         """Get cursor position in display coordinates."""
         display_row = 0
         for i in range(cursor_line):
-            line = lines[i]
-            if not line:
-                display_row += 1
-            else:
-                display_row += len(wrap_text(line, edit_w))
+            display_row += len(wrap_line(i))
 
         # Now find position within current line
-        current_line_text = lines[cursor_line]
-        if not current_line_text:
+        if not lines[cursor_line]:
             return display_row, cursor_col
 
-        wrapped = wrap_text(current_line_text, edit_w)
+        wrapped = wrap_line(cursor_line)
         chars_so_far = 0
         for i, wline in enumerate(wrapped):
             line_len = len(wline)
@@ -466,21 +848,20 @@ def get_multiline_input(stdscr, prompt_message, title=None, initial_content=None
         nonlocal scroll_offset
         display_lines, _ = get_display_lines()
 
-        # Clear editor area
+        # Repaint only the rows whose text changed since the last frame; typing
+        # usually touches one row, scrolling or a rewrap touches more
         for i in range(edit_h):
+            line_idx = scroll_offset + i
+            row_text = display_lines[line_idx][:edit_w] if line_idx < len(display_lines) else ""
+            if drawn_rows[i] == row_text:
+                continue
             try:
-                stdscr.addstr(edit_y + i, edit_x, " " * edit_w)
+                edit_win.move(i, 0)
+                edit_win.clrtoeol()
+                edit_win.addstr(i, 0, row_text)
             except curses.error:
                 pass
-
-        # Draw visible lines
-        for i in range(edit_h):
-            line_idx = scroll_offset + i
-            if line_idx < len(display_lines):
-                try:
-                    stdscr.addstr(edit_y + i, edit_x, display_lines[line_idx][:edit_w])
-                except curses.error:
-                    pass
+            drawn_rows[i] = row_text
 
         # Position cursor
         cursor_display_row, cursor_display_col = get_cursor_display_pos()
@@ -497,11 +878,98 @@ def get_multiline_input(stdscr, prompt_message, title=None, initial_content=None
             return
 
         try:
-            stdscr.move(edit_y + cursor_screen_row, edit_x + cursor_display_col)
+            edit_win.move(cursor_screen_row, cursor_display_col)
         except curses.error:
             pass
 
-        stdscr.refresh()
+        edit_win.noutrefresh()
+        curses.doupdate()
+
+    def backspace():
+        nonlocal cursor_line, cursor_col
+        if cursor_col > 0:
+            lines[cursor_line] = lines[cursor_line][:cursor_col-1] + lines[cursor_line][cursor_col:]
+            cursor_col -= 1
+        elif cursor_line > 0:
+            # Join with previous line
+            cursor_col = len(lines[cursor_line - 1])
+            lines[cursor_line - 1] += lines[cursor_line]
+            lines.pop(cursor_line)
+            cursor_line -= 1
+
+    def delete():
+        if cursor_col < len(lines[cursor_line]):
+            lines[cursor_line] = lines[cursor_line][:cursor_col] + lines[cursor_line][cursor_col+1:]
+        elif cursor_line < len(lines) - 1:
+            # Join with next line
+            lines[cursor_line] += lines[cursor_line + 1]
+            lines.pop(cursor_line + 1)
+
+    def newline():
+        nonlocal cursor_line, cursor_col
+        # Split line at cursor
+        new_line = lines[cursor_line][cursor_col:]
+        lines[cursor_line] = lines[cursor_line][:cursor_col]
+        lines.insert(cursor_line + 1, new_line)
+        cursor_line += 1
+        cursor_col = 0
+
+    def move_left():
+        nonlocal cursor_line, cursor_col
+        if cursor_col > 0:
+            cursor_col -= 1
+        elif cursor_line > 0:
+            cursor_line -= 1
+            cursor_col = len(lines[cursor_line])
+
+    def move_right():
+        nonlocal cursor_line, cursor_col
+        if cursor_col < len(lines[cursor_line]):
+            cursor_col += 1
+        elif cursor_line < len(lines) - 1:
+            cursor_line += 1
+            cursor_col = 0
+
+    def move_up():
+        nonlocal cursor_line, cursor_col
+        if cursor_line > 0:
+            cursor_line -= 1
+            cursor_col = min(cursor_col, len(lines[cursor_line]))
+
+    def move_down():
+        nonlocal cursor_line, cursor_col
+        if cursor_line < len(lines) - 1:
+            cursor_line += 1
+            cursor_col = min(cursor_col, len(lines[cursor_line]))
+
+    def move_home():
+        nonlocal cursor_col
+        cursor_col = 0
+
+    def move_end():
+        nonlocal cursor_col
+        cursor_col = len(lines[cursor_line])
+
+    def insert_tab():
+        nonlocal cursor_col
+        # Tab - insert spaces
+        spaces = "    "
+        lines[cursor_line] = lines[cursor_line][:cursor_col] + spaces + lines[cursor_line][cursor_col:]
+        cursor_col += len(spaces)
+
+    # Editing keys other than printable characters, Escape and Ctrl+C
+    key_handlers = {
+        curses.KEY_BACKSPACE: backspace, 127: backspace, 8: backspace,
+        curses.KEY_DC: delete,
+        curses.KEY_ENTER: newline, 10: newline, 13: newline,
+        curses.KEY_LEFT: move_left,
+        curses.KEY_RIGHT: move_right,
+        curses.KEY_UP: move_up,
+        curses.KEY_DOWN: move_down,
+        curses.KEY_HOME: move_home,
+        curses.KEY_END: move_end,
+        9: insert_tab,
+    }
 
     redraw()
 
@@ -512,7 +980,11 @@ def get_multiline_input(stdscr, prompt_message, title=None, initial_content=None
             curses.curs_set(0)
             return ""
 
-        if key == 27:  # Escape - save and exit
+        if 32 <= key <= 126:  # Printable ASCII, checked first as the common case
+            lines[cursor_line] = lines[cursor_line][:cursor_col] + chr(key) + lines[cursor_line][cursor_col:]
+            cursor_col += 1
+
+        elif key == 27:  # Escape - save and exit
             curses.curs_set(0)
             return "\n".join(lines)
 
@@ -520,244 +992,221 @@ def get_multiline_input(stdscr, prompt_message, title=None, initial_content=None
             curses.curs_set(0)
             return ""
 
-        elif key in (curses.KEY_BACKSPACE, 127, 8):  # Backspace
-            if cursor_col > 0:
-                lines[cursor_line] = lines[cursor_line][:cursor_col-1] + lines[cursor_line][cursor_col:]
-                cursor_col -= 1
-            elif cursor_line > 0:
-                # Join with previous line
-                cursor_col = len(lines[cursor_line - 1])
-                lines[cursor_line - 1] += lines[cursor_line]
-                lines.pop(cursor_line)
-                cursor_line -= 1
-
-        elif key in (curses.KEY_DC, 330):  # Delete key
-            if cursor_col < len(lines[cursor_line]):
-                lines[cursor_line] = lines[cursor_line][:cursor_col] + lines[cursor_line][cursor_col+1:]
-            elif cursor_line < len(lines) - 1:
-                # Join with next line
-                lines[cursor_line] += lines[cursor_line + 1]
-                lines.pop(cursor_line + 1)
-
-        elif key in (curses.KEY_ENTER, 10, 13):  # Enter
-            # Split line at cursor
-            new_line = lines[cursor_line][cursor_col:]
-            lines[cursor_line] = lines[cursor_line][:cursor_col]
-            lines.insert(cursor_line + 1, new_line)
-            cursor_line += 1
-            cursor_col = 0
-
-        elif key == curses.KEY_LEFT:
-            if cursor_col > 0:
-                cursor_col -= 1
-            elif cursor_line > 0:
-                cursor_line -= 1
-                cursor_col = len(lines[cursor_line])
-
-        elif key == curses.KEY_RIGHT:
-            if cursor_col < len(lines[cursor_line]):
-                cursor_col += 1
-            elif cursor_line < len(lines) - 1:
-                cursor_line += 1
-                cursor_col = 0
-
-        elif key == curses.KEY_UP:
-            if cursor_line > 0:
-                cursor_line -= 1
-                cursor_col = min(cursor_col, len(lines[cursor_line]))
-
-        elif key == curses.KEY_DOWN:
-            if cursor_line < len(lines) - 1:
-                cursor_line += 1
-                cursor_col = min(cursor_col, len(lines[cursor_line]))
-
-        elif key == curses.KEY_HOME:
-            cursor_col = 0
-
-        elif key == curses.KEY_END:
-            cursor_col = len(lines[cursor_line])
-
-        elif 32 <= key <= 126:  # Printable ASCII
-            lines[cursor_line] = lines[cursor_line][:cursor_col] + chr(key) + lines[cursor_line][cursor_col:]
-            cursor_col += 1
-
-        elif key == 9:  # Tab - insert spaces
-            spaces = "    "
-            lines[cursor_line] = lines[cursor_line][:cursor_col] + spaces + lines[cursor_line][cursor_col:]
-            cursor_col += len(spaces)
+        else:
+            handler = key_handlers.get(key)
+            if handler:
+                handler()
 
         redraw()
 
 
 # --- Markdown Rendering ---
 
-def render_markdown_line(stdscr, y, x, line, max_width):
+# Compiled once at import; these run on every visible line of every frame
+_HEADER_RE = re.compile(r'^(#{1,6})\s+(.*)$')
+_LIST_RE = re.compile(r'^(\s*)([-*]|\d+\.)\s+(.*)$')
+# Order matters: check bold (**) before italic (*). Exactly one named group
+# matches, so match.lastgroup says which style applies.
+_INLINE_RE = re.compile(r'\*\*(?P<bold>.+?)\*\*|`(?P<code>.+?)`|\*(?P<star>.+?)\*|_(?P<underscore>.+?)_')
+
+def render_markdown_line(stdscr, y, x, line, max_width, screen_h):
     """
     Renders a single line with markdown formatting.
     Returns the number of lines consumed (for wrapped content).
     Supports: headers (#), bold (**), italic (*), inline code (`), lists (- * 1.)
+    screen_h is the window height, looked up once by the caller.
     """
-    if y >= curses.LINES - 2:
+    if y >= screen_h - 2:
         return 0
 
+    runs = tokenize_markdown(line, max_width)
+    if runs:
+        try:
+            stdscr.move(y, x)
+        except curses.error:
+            return 1
+        for attr, text in runs:
+            try:
+                stdscr.addstr(text, attr) # Continues from the end of the previous run
+            except curses.error:
+                pass
+    return 1
+
+
+@lru_cache(maxsize=512) # Lines are re-rendered as the view scrolls back over them
+def tokenize_markdown(line, max_width):
+    """
+    Converts a line into the (attribute, text) runs that render_markdown_line
+    writes left to right, already cut to max_width.
+    """
+    # Most lines are plain text; only run the block patterns when the first
+    # non-blank character could start a header or list item
+    head = line.lstrip()[:1]
+
     # Check for headers
-    header_match = re.match(r'^(#{1,6})\s+(.*)$', line)
+    header_match = _HEADER_RE.match(line) if head == '#' else None
     if header_match:
         level = len(header_match.group(1))
         text = header_match.group(2)
         prefix = "═" * (4 - min(level, 3)) + " "
-        try:
-            stdscr.attron(curses.color_pair(3) | curses.A_BOLD)
-            display_text = prefix + text
-            if len(display_text) > max_width:
-                display_text = display_text[:max_width-3] + "..."
-            stdscr.addstr(y, x, display_text)
-            stdscr.attroff(curses.color_pair(3) | curses.A_BOLD)
-        except curses.error:
-            pass
-        return 1
+        display_text = prefix + text
+        if len(display_text) > max_width:
+            display_text = display_text[:max_width-3] + "..."
+        return ((_HEADER_ATTR, display_text),)
 
     # Check for list items
-    list_match = re.match(r'^(\s*)([-*]|\d+\.)\s+(.*)$', line)
+    list_match = _LIST_RE.match(line) if head and (head in '-*' or head.isdigit()) else None
     if list_match:
         indent = list_match.group(1)
         marker = list_match.group(2)
         text = list_match.group(3)
-        try:
-            stdscr.addstr(y, x, indent)
-            stdscr.attron(curses.color_pair(5) | curses.A_BOLD)
-            if marker in ['-', '*']:
-                stdscr.addstr("• ")
-            else:
-                stdscr.addstr(marker + " ")
-            stdscr.attroff(curses.color_pair(5) | curses.A_BOLD)
-            render_inline_markdown(stdscr, y, x + len(indent) + len(marker) + 2, text, max_width - len(indent) - len(marker) - 2)
-        except curses.error:
-            pass
-        return 1
+        bullet = "• " if marker in ['-', '*'] else marker + " "
+        runs = [(curses.A_NORMAL, indent)] if indent else []
+        # The item text starts one column past the bullet's trailing space
+        runs += [(_LIST_MARKER_ATTR, bullet), (curses.A_NORMAL, " ")]
+        runs.extend(inline_markdown_runs(text, max_width - len(indent) - len(marker) - 2))
+        return tuple(runs)
 
     # Check for code block marker
-    if line.strip().startswith('```'):
-        try:
-            stdscr.attron(curses.color_pair(4))
-            stdscr.addstr(y, x, "─" * min(max_width, 40))
-            stdscr.attroff(curses.color_pair(4))
-        except curses.error:
-            pass
-        return 1
+    if head == '`' and line.lstrip().startswith('```'):
+        return ((_CODE_ATTR, "─" * min(max_width, 40)),)
 
     # Regular line - render with inline formatting
-    render_inline_markdown(stdscr, y, x, line, max_width)
-    return 1
+    return tuple(inline_markdown_runs(line, max_width))
 
 
-def render_inline_markdown(stdscr, y, x, text, max_width):
+def inline_markdown_runs(text, max_width):
     """
-    Renders inline markdown formatting: bold (**), italic (*), inline code (`).
+    Splits text into (attribute, text) runs for inline markdown formatting:
+    bold (**), italic (*), inline code (`). Runs are cut to max_width in total.
     """
-    if not text or x >= curses.COLS - 1:
-        return
+    if not text or max_width <= 0:
+        return []
 
-    # Pattern to match markdown inline elements
-    # Order matters: check bold (**) before italic (*)
-    pattern = r'(\*\*(.+?)\*\*)|(`(.+?)`)|(\*(.+?)\*)|(_(.+?)_)'
+    if text.count('*') < 2 and text.count('`') < 2 and text.count('_') < 2:
+        # Every inline pattern needs a pair of markers, so a line without
+        # one (plain prose, a lone snake_case name) is a single run
+        return [(curses.A_NORMAL, text[:max_width])]
 
+    runs = []
     pos = 0
-    current_x = x
-
-    for match in re.finditer(pattern, text):
-        # Print text before the match
-        before_text = text[pos:match.start()]
-        if before_text and current_x < x + max_width:
-            try:
-                display_text = before_text[:max(0, x + max_width - current_x)]
-                stdscr.addstr(y, current_x, display_text)
-                current_x += len(display_text)
-            except curses.error:
-                pass
-
-        if current_x >= x + max_width:
-            return
-
-        # Determine which group matched and apply formatting
-        if match.group(2):  # Bold **text**
-            content = match.group(2)
-            try:
-                stdscr.attron(curses.A_BOLD)
-                display_text = content[:max(0, x + max_width - current_x)]
-                stdscr.addstr(y, current_x, display_text)
-                stdscr.attroff(curses.A_BOLD)
-                current_x += len(display_text)
-            except curses.error:
-                pass
-        elif match.group(4):  # Inline code `text`
-            content = match.group(4)
-            try:
-                stdscr.attron(curses.color_pair(4))
-                display_text = content[:max(0, x + max_width - current_x)]
-                stdscr.addstr(y, current_x, display_text)
-                stdscr.attroff(curses.color_pair(4))
-                current_x += len(display_text)
-            except curses.error:
-                pass
-        elif match.group(6):  # Italic *text*
-            content = match.group(6)
-            try:
-                stdscr.attron(curses.A_DIM)
-                display_text = content[:max(0, x + max_width - current_x)]
-                stdscr.addstr(y, current_x, display_text)
-                stdscr.attroff(curses.A_DIM)
-                current_x += len(display_text)
-            except curses.error:
-                pass
-        elif match.group(8):  # Italic _text_
-            content = match.group(8)
-            try:
-                stdscr.attron(curses.A_DIM)
-                display_text = content[:max(0, x + max_width - current_x)]
-                stdscr.addstr(y, current_x, display_text)
-                stdscr.attroff(curses.A_DIM)
-                current_x += len(display_text)
-            except curses.error:
-                pass
-
+    for match in _INLINE_RE.finditer(text):
+        if match.start() > pos:
+            runs.append((curses.A_NORMAL, text[pos:match.start()]))
+        kind = match.lastgroup
+        if kind == 'bold':  # Bold **text**
+            attr = curses.A_BOLD
+        elif kind == 'code':  # Inline code `text`
+            attr = _CODE_ATTR
+        else:  # Italic *text* or _text_
+            attr = curses.A_DIM
+        runs.append((attr, match.group(kind)))
         pos = match.end()
-
-    # Print remaining text after last match
-    remaining = text[pos:]
-    if remaining and current_x < x + max_width:
-        try:
-            display_text = remaining[:max(0, x + max_width - current_x)]
-            stdscr.addstr(y, current_x, display_text)
-        except curses.error:
-            pass
+    if pos < len(text):
+        runs.append((curses.A_NORMAL, text[pos:]))
+
+    # Keep only what fits in max_width
+    fitted = []
+    remaining = max_width
+    for attr, run_text in runs:
+        if remaining <= 0:
+            break
+        run_text = run_text[:remaining]
+        fitted.append((attr, run_text))
+        remaining -= len(run_text)
+    return fitted
 
 
 # --- UI Screens ---
 
+# Key codes for the screen dispatch loops, resolved once at import. Letter
+# commands compare `key | 0x20`, computed once per key, so 'b' and 'B' match
+# in a single test.
+_KEY_UP = curses.KEY_UP
+_KEY_DOWN = curses.KEY_DOWN
+_KEY_LEFT = curses.KEY_LEFT
+_KEY_RIGHT = curses.KEY_RIGHT
+_KEY_RESIZE = curses.KEY_RESIZE
+_ENTER_KEYS = (curses.KEY_ENTER, 10, 13) # KEY_ENTER, LF, CR
+_K_B, _K_D, _K_E, _K_M, _K_N, _K_Q, _K_T = map(ord, "bdemnqt")
+_K_HELP = ord('?')
+_K_SEARCH = ord('/')
+
+def _coalesce_resize(stdscr):
+    """
+    Swallows the burst of KEY_RESIZE events a window drag produces, so the
+    caller lays the screen out once for the final size. A real key read
+    while draining is pushed back for the caller's next getch().
+    """
+    stdscr.timeout(30)
+    try:
+        key = stdscr.getch()
+        while key == _KEY_RESIZE:
+            key = stdscr.getch()
+    finally:
+        stdscr.timeout(-1)
+    if key != -1:
+        curses.ungetch(key)
+    curses.update_lines_cols()
+
+def _count_repeats(stdscr, key):
+    """
+    Returns how many presses of key are waiting, counting the one just read,
+    so a held arrow key moves as far as it should but renders once. The
+    first other key read is pushed back for the caller's next getch().
+    """
+    count = 1
+    stdscr.nodelay(True)
+    try:
+        next_key = stdscr.getch()
+        while next_key == key:
+            count += 1
+            next_key = stdscr.getch()
+    finally:
+        stdscr.nodelay(False)
+    if next_key != -1:
+        curses.ungetch(next_key)
+    return count
+
+_MENU_TITLE = "Python Journal TUI"
+_MENU_OPTIONS = ("View Entries", "Add New Entry", "Search Entries", "Filter by Tag", "Exit")
+
+@lru_cache(maxsize=4)
+def _main_menu_layout(h, w):
+    """Returns the title column and the (y, x, normal_text, selected_text) of each menu option for a screen size."""
+    title_x = (w - len(_MENU_TITLE)) // 2
+    rows = []
+    for i, option in enumerate(_MENU_OPTIONS):
+        y_pos = h // 2 - len(_MENU_OPTIONS) // 2 + i + 2 # +2 for title and spacing
+        x_pos = (w - len(option)) // 2
+        rows.append((y_pos, x_pos, f"  {option}  ", f"> {option} <"))
+    return title_x, tuple(rows)
+
+def _draw_main_menu_option(stdscr, rows, idx, selected):
+    """Draws one main menu option, highlighted if selected."""
+    y_pos, x_pos, normal_text, selected_text = rows[idx]
+    if selected:
+        stdscr.attron(_SELECTED_ATTR) # Highlight selected
+        stdscr.addstr(y_pos, x_pos, selected_text)
+        stdscr.attroff(_SELECTED_ATTR)
+    else:
+        stdscr.addstr(y_pos, x_pos, normal_text)
+
 def display_main_menu(stdscr, selected_option_idx):
     """Displays the main menu and highlights the selected option."""
     stdscr.clear()
     h, w = stdscr.getmaxyx()
-    menu_title = "Python Journal TUI"
-    options = ["View Entries", "Add New Entry", "Search Entries", "Filter by Tag", "Exit"]
+    title_x, rows = _main_menu_layout(h, w)
 
-    stdscr.addstr(1, (w - len(menu_title)) // 2, menu_title, curses.A_BOLD | curses.A_UNDERLINE)
+    stdscr.addstr(1, title_x, _MENU_TITLE, curses.A_BOLD | curses.A_UNDERLINE)
 
     # Show entry count
-    entry_count = len(get_all_entries_db())
+    entry_count = count_entries_db() # Cached until the next write
     count_text = f"{entry_count} entry" if entry_count == 1 else f"{entry_count} entries"
     stdscr.addstr(3, (w - len(count_text)) // 2, count_text)
 
-    for i, option in enumerate(options):
-        y_pos = h // 2 - len(options) // 2 + i + 2 # +2 for title and spacing
-        x_pos = (w - len(option)) // 2
-        if i == selected_option_idx:
-            stdscr.attron(curses.color_pair(1)) # Highlight selected
-            stdscr.addstr(y_pos, x_pos, f"> {option} <")
-            stdscr.attroff(curses.color_pair(1))
-        else:
-            stdscr.addstr(y_pos, x_pos, f"  {option}  ")
+    for i in range(len(rows)):
+        _draw_main_menu_option(stdscr, rows, i, i == selected_option_idx)
 
     # Show database location
     db_path = DATABASE_NAME.replace(os.path.expanduser('~'), '~')
@@ -768,200 +1217,324 @@ def display_main_menu(stdscr, selected_option_idx):
     stdscr.addstr(h - 2, 2, "UP/DOWN: Navigate, ENTER: Select, T: Theme, Q: Quit, ?: Help")
     stdscr.refresh()
 
-def display_entries_list(stdscr, entries, current_page, items_per_page, selected_idx_on_page):
-    """Displays a paginated list of journal entries."""
-    stdscr.clear()
+def update_main_menu_selection(stdscr, old_idx, new_idx):
+    """Moves the main menu highlight by redrawing only the two affected options."""
+    h, w = stdscr.getmaxyx()
+    _, rows = _main_menu_layout(h, w)
+    _draw_main_menu_option(stdscr, rows, old_idx, False)
+    _draw_main_menu_option(stdscr, rows, new_idx, True)
+    stdscr.refresh()
+
+_row_cache = {} # entry id -> (width, row_text, tags_str), valid until the list reloads
+
+def _format_entry_row(entry, tags, w):
+    """Returns the (row_text, tags_str) pair for an entries list row, cached per entry and width."""
+    entry_id, formatted_time, title = entry
+    cached = _row_cache.get(entry_id)
+    if cached is not None and cached[0] == w:
+        return cached[1], cached[2]
+
+    tags_str = f" [{', '.join(tags)}]" if tags else ""
+    row_text = f"{formatted_time} - {title}"
+    if len(row_text) + len(tags_str) > w - 4:
+        # Truncate but try to show some tags
+        row_text = f"{row_text}{tags_str}"[:w-7] + "..."
+        tags_str = ""
+
+    _row_cache[entry_id] = (w, row_text, tags_str)
+    return row_text, tags_str
+
+def _draw_entry_row(win, y, entry, tags, selected, w):
+    """Draws a single row of the entries list, highlighted if selected."""
+    row_text, tags_str = _format_entry_row(entry, tags, w)
+
+    if selected:
+        win.attron(_SELECTED_ATTR)
+        win.addstr(y, 2, "> ")
+        win.addstr(row_text)
+        if tags_str:
+            win.addstr(tags_str)
+        win.attroff(_SELECTED_ATTR)
+    else:
+        win.addstr(y, 2, "  ")
+        win.addstr(row_text)
+        if tags_str:
+            win.attron(_TAG_ATTR)
+            win.addstr(tags_str)
+            win.attroff(_TAG_ATTR)
+
+_entries_pad = None # Reused by build_entries_pad instead of allocating a pad per page
+
+def build_entries_pad(paginated_entries, page_tags, selected_idx_on_page, w):
+    """Renders all rows of a page into an off-screen pad that can be copied to the screen."""
+    global _entries_pad
+    # One spare row so writing the last cell of the last entry doesn't fail
+    rows = len(paginated_entries) + 1
+    if _entries_pad is None:
+        _entries_pad = curses.newpad(rows, w)
+    else:
+        _entries_pad.resize(rows, w)
+        _entries_pad.erase()
+    pad = _entries_pad
+    pad.bkgd(' ', _BACKGROUND_ATTR)
+    for i, entry in enumerate(paginated_entries):
+        _draw_entry_row(pad, i, entry, page_tags.get(entry['id']), i == selected_idx_on_page, w)
+    return pad
+
+def _show_entries_pad(stdscr, list_pad, entry_count):
+    """Queues the visible part of the entries pad below the list header."""
+    h, w = stdscr.getmaxyx()
+    last_row = min(2 + entry_count - 1, h - 4)
+    if entry_count and last_row >= 2:
+        list_pad.noutrefresh(0, 0, 2, 0, last_row, w - 1)
+
+def display_entries_list(stdscr, list_pad, entry_count, total_entries, current_page, items_per_page):
+    """Displays one page of journal entries."""
+    stdscr.erase() # Let curses send only the cells that changed
     h, w = stdscr.getmaxyx()
     stdscr.addstr(0, 0, "Journal Entries (N: New, B: Back, Q: Quit)", curses.A_BOLD)
     stdscr.addstr(1,0, "-" * (w-1))
 
-    if not entries:
+    if not entry_count:
         stdscr.addstr(3, 2, "No entries yet. Press 'N' to create one.")
-        stdscr.refresh()
-        return [] # Return empty list for paginated_entries
-
-    start_index = current_page * items_per_page
-    end_index = start_index + items_per_page
-    paginated_entries = entries[start_index:end_index]
-
-    line_num = 2
-    for i, entry in enumerate(paginated_entries):
-        # entry format: (id, formatted_time, title)
-        entry_id = entry[0]
-        tags = get_entry_tags(entry_id)
-        tags_str = f" [{', '.join(tags)}]" if tags else ""
-
-        display_text = f"{entry[1]} - {entry[2]}" # Timestamp - Title
-        full_text = display_text + tags_str
-
-        if i == selected_idx_on_page:
-            stdscr.attron(curses.color_pair(1))
-            if len(full_text) > w - 4:
-                # Truncate but try to show some tags
-                stdscr.addstr(line_num + i, 2, f"> {full_text[:w-7]}...")
-            else:
-                stdscr.addstr(line_num + i, 2, f"> {display_text}")
-                if tags_str:
-                    stdscr.addstr(tags_str)
-            stdscr.attroff(curses.color_pair(1))
-        else:
-            if len(full_text) > w - 4:
-                stdscr.addstr(line_num + i, 2, f"  {full_text[:w-7]}...")
-            else:
-                stdscr.addstr(line_num + i, 2, f"  {display_text}")
-                if tags_str:
-                    stdscr.attron(curses.color_pair(5))
-                    stdscr.addstr(tags_str)
-                    stdscr.attroff(curses.color_pair(5))
+        stdscr.noutrefresh()
+        curses.doupdate()
+        return
 
     # Pagination info
-    total_pages = (len(entries) + items_per_page - 1) // items_per_page
+    total_pages = (total_entries + items_per_page - 1) // items_per_page
     if total_pages == 0: total_pages = 1
     page_info = f"Page {current_page + 1}/{total_pages}"
     stdscr.addstr(h - 3, 2, page_info)
     stdscr.addstr(h - 2, 2, "UP/DOWN: Navigate, ENTER: View, D: Delete, /: Search, M: Main Menu")
-    stdscr.refresh()
-    return paginated_entries
+    stdscr.noutrefresh()
+    _show_entries_pad(stdscr, list_pad, entry_count) # Rows are copied from the pad, not redrawn
+    curses.doupdate()
+
+def update_entries_selection(stdscr, list_pad, paginated_entries, page_tags, old_idx, new_idx):
+    """Moves the highlight in the entries list by redrawing only the two affected rows of the pad."""
+    w = stdscr.getmaxyx()[1]
+    for idx in (old_idx, new_idx):
+        if 0 <= idx < len(paginated_entries):
+            entry = paginated_entries[idx]
+            _draw_entry_row(list_pad, idx, entry, page_tags.get(entry['id']), idx == new_idx, w)
+    _show_entries_pad(stdscr, list_pad, len(paginated_entries))
+    curses.doupdate()
+
+
+# Every separator str.splitlines() breaks on besides '\n'
+_OTHER_LINE_BREAKS_RE = re.compile('[\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]')
+
+def split_content_lines(content):
+    """
+    Splits entry content into lines like str.splitlines(). Content saved by the
+    editor only ever uses '\n', so that case takes the cheaper str.split().
+    """
+    if _OTHER_LINE_BREAKS_RE.search(content):
+        return content.splitlines()
+    lines = content.split('\n')
+    if not lines[-1]:
+        lines.pop() # splitlines() drops the empty piece after a final newline
+    return lines
+
+
+def iter_content_lines(content):
+    """Yields the lines of split_content_lines(content) one at a time, without splitting it all up front."""
+    if _OTHER_LINE_BREAKS_RE.search(content):
+        yield from content.splitlines()
+        return
+    start = 0
+    end = content.find('\n')
+    while end != -1:
+        yield content[start:end]
+        start = end + 1
+        end = content.find('\n', start)
+    if start < len(content):
+        yield content[start:]
+
+
+def build_display_lines(content_lines, display_width):
+    """
+    Wraps content lines for display and tracks code block state.
+    Each item: (wrapped_line_text, is_code_block, is_code_fence, original_line_idx)
+    """
+    return list(iter_display_lines(content_lines, display_width))
+
+
+def iter_display_lines(content_lines, display_width):
+    """Yields the items of build_display_lines one at a time, wrapping lazily."""
+    in_code_block = False
+
+    for orig_idx, line in enumerate(content_lines):
+        # Only indented lines pay for an lstrip() copy to find a fence
+        is_code_fence = line.startswith('```') or (line[:1].isspace() and line.lstrip().startswith('```'))
+
+        if is_code_fence:
+            in_code_block = not in_code_block
+            yield (line, False, True, orig_idx)
+        elif in_code_block:
+            # Don't word-wrap code blocks, just truncate or show as-is
+            yield (line, True, False, orig_idx)
+        elif not line or line.isspace():
+            # Empty line
+            yield ("", False, False, orig_idx)
+        else:
+            # Word wrap regular text
+            for wrapped_line in wrap_text(line, display_width):
+                yield (wrapped_line, False, False, orig_idx)
+
+
+@lru_cache(maxsize=16) # Revisiting an entry, or saving it unchanged, skips the rewrap
+def _wrapped_content(content, display_width):
+    """
+    Returns the (display_lines, pending) pair for content at this width: the
+    lines wrapped so far and the iterator that yields the rest. Every view of
+    the same content shares the pair, extending the list as it scrolls.
+    """
+    return [], iter_display_lines(iter_content_lines(content), display_width)
 
 
 def view_single_entry_screen(stdscr, entry_id):
     """Displays the full content of a single journal entry with word wrapping."""
-    entry = get_entry_db(entry_id)
-    stdscr.clear()
+    entry, tags = get_entry_with_tags_db(entry_id)
+    stdscr.erase()
     h, w = stdscr.getmaxyx()
 
     if not entry:
         display_message(stdscr, "Error: Entry not found. Press any key to return.")
         return
 
-    # entry format: (id, formatted_time, title, content)
-    title_line = f"Title: {entry[2]} (ID: {entry[0]})"
-    timestamp_line = f"Date: {entry[1]}"
-    tags = get_entry_tags(entry_id)
+    title_line = f"Title: {entry['title']} (ID: {entry['id']})"
+    timestamp_line = f"Date: {entry['formatted_time']}"
     tags_line = f"Tags: {', '.join(tags)}" if tags else "Tags: (none)"
 
-    stdscr.addstr(0, 0, title_line, curses.A_BOLD)
-    stdscr.addstr(1, 0, timestamp_line)
-    stdscr.addstr(2, 0, tags_line, curses.color_pair(5))
-    stdscr.addstr(3, 0, "-" * (w - 1))
+    def draw_header():
+        stdscr.addstr(0, 0, title_line, curses.A_BOLD)
+        stdscr.addstr(1, 0, timestamp_line)
+        stdscr.addstr(2, 0, tags_line, _TAG_ATTR)
+        stdscr.addstr(3, 0, "-" * (w - 1))
 
-    content_lines = entry[3].splitlines()
+    draw_header()
+
+    content = entry['content']
     current_display_line = 4
     scroll_offset = 0 # For scrolling content if it's too long
     display_width = w - 1
 
-    # Pre-process: wrap lines and track code block state for each display line
-    # Each item: (wrapped_line_text, is_code_block, is_code_fence, original_line_idx)
-    display_lines = []
-    in_code_block = False
+    # Wrap once per content and width, not per keypress, and only as far down
+    # as any view has scrolled
+    display_lines, pending_lines = _wrapped_content(content, display_width)
 
-    for orig_idx, line in enumerate(content_lines):
-        is_code_fence = line.strip().startswith('```')
+    def reset_display_lines():
+        nonlocal display_lines, pending_lines
+        display_lines, pending_lines = _wrapped_content(content, display_width)
 
-        if is_code_fence:
-            in_code_block = not in_code_block
-            display_lines.append((line, False, True, orig_idx))
-        elif in_code_block:
-            # Don't word-wrap code blocks, just truncate or show as-is
-            display_lines.append((line, True, False, orig_idx))
-        elif not line.strip():
-            # Empty line
-            display_lines.append(("", False, False, orig_idx))
+    def fill_display_lines(count):
+        """Wraps more content until there are count display lines or it runs out."""
+        if len(display_lines) < count:
+            display_lines.extend(itertools.islice(pending_lines, count - len(display_lines)))
+
+    def draw_content_line(i):
+        """Renders the display line shown at row i of the content area."""
+        display_idx = scroll_offset + i
+        if display_idx >= len(display_lines):
+            return
+        line_text, is_code, is_fence, _ = display_lines[display_idx]
+
+        if is_fence:
+            # Render code fence marker
+            render_markdown_line(stdscr, current_display_line + i, 0, line_text, display_width, h)
+        elif is_code:
+            # Inside code block - use code color without markdown parsing
+            try:
+                stdscr.attron(_CODE_ATTR)
+                display_text = line_text[:display_width] if len(line_text) > display_width else line_text
+                stdscr.addstr(current_display_line + i, 0, display_text)
+                stdscr.attroff(_CODE_ATTR)
+            except curses.error:
+                pass
         else:
-            # Word wrap regular text
-            wrapped = wrap_text(line, display_width)
-            for wrap_idx, wrapped_line in enumerate(wrapped):
-                # Only first wrapped segment gets markdown rendering for headers/lists
-                display_lines.append((wrapped_line, False, False, orig_idx))
+            # Render with markdown formatting
+            render_markdown_line(stdscr, current_display_line + i, 0, line_text, display_width, h)
 
-    while True:
-        stdscr.move(current_display_line, 0) # Move cursor to start of content area
-        stdscr.clrtobot() # Clear from cursor to bottom of screen
+    redraw = True # Set whenever the whole content area must be repainted
+    scroll_step = 0 # -1/+1 when the last key scrolled by one line
 
+    while True:
         # Display content with scrolling
         lines_to_display = h - current_display_line - 2 # -2 for bottom message
 
-        for i in range(lines_to_display):
-            display_idx = scroll_offset + i
-            if display_idx < len(display_lines):
-                line_text, is_code, is_fence, _ = display_lines[display_idx]
-
-                if is_fence:
-                    # Render code fence marker
-                    render_markdown_line(stdscr, current_display_line + i, 0, line_text, display_width)
-                elif is_code:
-                    # Inside code block - use code color without markdown parsing
-                    try:
-                        stdscr.attron(curses.color_pair(4))
-                        display_text = line_text[:display_width] if len(line_text) > display_width else line_text
-                        stdscr.addstr(current_display_line + i, 0, display_text)
-                        stdscr.attroff(curses.color_pair(4))
-                    except curses.error:
-                        pass
-                else:
-                    # Render with markdown formatting
-                    render_markdown_line(stdscr, current_display_line + i, 0, line_text, display_width)
+        if scroll_step and abs(scroll_step) >= lines_to_display:
+            redraw = True # Nothing on screen would survive the shift
+        if redraw:
+            fill_display_lines(scroll_offset + lines_to_display)
+            stdscr.move(current_display_line, 0) # Move cursor to start of content area
+            stdscr.clrtobot() # Clear from cursor to bottom of screen
+            for i in range(min(lines_to_display, len(display_lines) - scroll_offset)):
+                draw_content_line(i)
+            stdscr.addstr(h - 1, 0, "B: Back, E: Edit, M: Main Menu, UP/DOWN: Scroll, Q: Quit")
+            redraw = False
+        elif scroll_step:
+            # Shift the content area and render only the lines scrolled into view
+            stdscr.setscrreg(current_display_line, current_display_line + lines_to_display - 1)
+            stdscr.scrollok(True)
+            stdscr.scroll(scroll_step)
+            stdscr.scrollok(False)
+            stdscr.setscrreg(0, h - 1)
+            if scroll_step > 0:
+                new_rows = range(lines_to_display - scroll_step, lines_to_display)
             else:
-                break # No more content lines
-
-        stdscr.addstr(h - 1, 0, "B: Back, E: Edit, M: Main Menu, UP/DOWN: Scroll, Q: Quit")
-        stdscr.refresh()
+                new_rows = range(-scroll_step)
+            for i in new_rows:
+                draw_content_line(i)
+        scroll_step = 0
+        stdscr.noutrefresh()
+        curses.doupdate()
 
         key = stdscr.getch()
-        if key == ord('b') or key == ord('B'):
+        letter = key | 0x20
+        if key == _KEY_UP: # Scrolling keys first, they repeat the most
+            scroll_step = -min(_count_repeats(stdscr, key), scroll_offset)
+            scroll_offset += scroll_step
+        elif key == _KEY_DOWN:
+            # Only scroll down if there's more content to show
+            steps = _count_repeats(stdscr, key)
+            fill_display_lines(scroll_offset + lines_to_display + steps)
+            scroll_step = max(min(steps, len(display_lines) - lines_to_display - scroll_offset), 0)
+            scroll_offset += scroll_step
+        elif letter == _K_B:
             break
-        elif key == ord('e') or key == ord('E'):
+        elif letter == _K_E:
             if edit_entry_screen(stdscr, entry_id):
                 # Reload the entry after editing
-                entry = get_entry_db(entry_id)
+                entry, tags = get_entry_with_tags_db(entry_id)
                 if entry:
-                    title_line = f"Title: {entry[2]} (ID: {entry[0]})"
-                    timestamp_line = f"Date: {entry[1]}"
-                    tags = get_entry_tags(entry_id)
+                    title_line = f"Title: {entry['title']} (ID: {entry['id']})"
+                    timestamp_line = f"Date: {entry['formatted_time']}"
                     tags_line = f"Tags: {', '.join(tags)}" if tags else "Tags: (none)"
-                    content_lines = entry[3].splitlines()
-                    # Rebuild display_lines
-                    display_lines = []
-                    in_code_block = False
-                    for orig_idx, line in enumerate(content_lines):
-                        is_code_fence = line.strip().startswith('```')
-                        if is_code_fence:
-                            in_code_block = not in_code_block
-                            display_lines.append((line, False, True, orig_idx))
-                        elif in_code_block:
-                            display_lines.append((line, True, False, orig_idx))
-                        elif not line.strip():
-                            display_lines.append(("", False, False, orig_idx))
-                        else:
-                            wrapped = wrap_text(line, display_width)
-                            for wrap_idx, wrapped_line in enumerate(wrapped):
-                                display_lines.append((wrapped_line, False, False, orig_idx))
+                    content = entry['content']
+                    reset_display_lines()
                     scroll_offset = 0
             # Redraw header after returning from edit
             stdscr.clear()
-            stdscr.addstr(0, 0, title_line, curses.A_BOLD)
-            stdscr.addstr(1, 0, timestamp_line)
-            stdscr.addstr(2, 0, tags_line, curses.color_pair(5))
-            stdscr.addstr(3, 0, "-" * (w - 1))
-        elif key == ord('m') or key == ord('M'):
+            draw_header()
+            redraw = True
+        elif letter == _K_M:
             return "GOTO_MAIN"  # Return to main menu immediately
-        elif key == ord('q') or key == ord('Q'):
+        elif letter == _K_Q:
             if confirm_action(stdscr, "Quit to main menu? (y/N):"):
                 return "QUIT_APP" # Special signal
-            else: # Redraw after confirm_action clears screen
-                stdscr.clear()
-                stdscr.addstr(0, 0, title_line, curses.A_BOLD)
-                stdscr.addstr(1, 0, timestamp_line)
-                stdscr.addstr(2, 0, tags_line, curses.color_pair(5))
-                stdscr.addstr(3, 0, "-" * (w - 1))
-                # No need to redraw content here, loop will do it
-        elif key == curses.KEY_UP:
-            if scroll_offset > 0:
-                scroll_offset -= 1
-        elif key == curses.KEY_DOWN:
-            # Only scroll down if there's more content to show
-            if scroll_offset + lines_to_display < len(display_lines):
-                scroll_offset += 1
+        elif key == _KEY_RESIZE:
+            _coalesce_resize(stdscr)
+            # Re-wrap for the new width
+            h, w = stdscr.getmaxyx()
+            display_width = w - 1
+            reset_display_lines()
+            fill_display_lines(scroll_offset + 1)
+            scroll_offset = min(scroll_offset, max(0, len(display_lines) - 1))
+            stdscr.erase()
+            draw_header()
+            redraw = True
     return None
 
 
@@ -1001,7 +1574,7 @@ def add_new_entry_screen(stdscr):
                 max_tag_width = w - 4
                 if len(existing_str) > max_tag_width:
                     existing_str = existing_str[:max_tag_width - 3] + "..."
-                stdscr.addstr(6, 2, existing_str, curses.color_pair(5))
+                stdscr.addstr(6, 2, existing_str, _TAG_ATTR)
                 tags_input = get_text_input(stdscr, "Tags: ", 8, 2, max_len=w-10)
             else:
                 tags_input = get_text_input(stdscr, "Tags: ", 5, 2, max_len=w-10)
@@ -1025,9 +1598,8 @@ def edit_entry_screen(stdscr, entry_id):
         display_message(stdscr, "Error: Entry not found. Press any key.")
         return False
 
-    # entry format: (id, formatted_time, title, content)
-    current_title = entry[2]
-    current_content = entry[3]
+    current_title = entry['title']
+    current_content = entry['content']
     current_tags = get_entry_tags(entry_id)
 
     stdscr.clear()
@@ -1063,7 +1635,7 @@ def edit_entry_screen(stdscr, entry_id):
                 max_tag_width = w - 4
                 if len(existing_str) > max_tag_width:
                     existing_str = existing_str[:max_tag_width - 3] + "..."
-                stdscr.addstr(7, 2, existing_str, curses.color_pair(5))
+                stdscr.addstr(7, 2, existing_str, _TAG_ATTR)
                 tags_input = get_text_input(stdscr, "Tags: ", 9, 2, max_len=w-10)
             else:
                 tags_input = get_text_input(stdscr, "Tags: ", 6, 2, max_len=w-10)
@@ -1112,91 +1684,121 @@ def search_entries_screen(stdscr):
 
 def search_results_loop(stdscr, results, search_term):
     """Manages display and interaction with search results."""
+    return entry_results_loop(stdscr, results, f"Search Results for '{search_term}' ({len(results)} found)")
+
+
+def entry_results_loop(stdscr, entries, header):
+    """
+    Pages through a fixed list of (id, formatted_time, title) rows and opens
+    the selected entry on Enter. Shared by the search and tag result screens.
+    """
     current_page = 0
     items_per_page = curses.LINES - 6
     if items_per_page <= 0:
         items_per_page = 1
     selected_idx_on_page = 0
+    total_entries = len(entries) # The results are fixed for the life of this screen
+    paged = False # Cleared whenever the page or the page size changes
+    redraw = True # Set whenever the whole page must be repainted
+    drawn_idx = 0
 
     while True:
-        total_entries = len(results)
-        total_pages = (total_entries + items_per_page - 1) // items_per_page
-        if total_pages == 0:
-            total_pages = 1
-        current_page = max(0, min(current_page, total_pages - 1))
-
-        entries_on_this_page_count = len(results[current_page * items_per_page : (current_page + 1) * items_per_page])
-        selected_idx_on_page = max(0, min(selected_idx_on_page, entries_on_this_page_count - 1 if entries_on_this_page_count > 0 else 0))
+        if not paged:
+            total_pages = (total_entries + items_per_page - 1) // items_per_page
+            if total_pages == 0:
+                total_pages = 1
+            current_page = max(0, min(current_page, total_pages - 1))
+
+            # Slice the page once per page change, not on every keypress
+            start_index = current_page * items_per_page
+            paginated_entries = entries[start_index:start_index + items_per_page]
+            entries_on_this_page_count = len(paginated_entries)
+            selected_idx_on_page = max(0, min(selected_idx_on_page, entries_on_this_page_count - 1 if entries_on_this_page_count > 0 else 0))
+            paged = True
+
+        if redraw:
+            stdscr.clear()
+            h, w = stdscr.getmaxyx()
+            stdscr.addstr(0, 0, header, curses.A_BOLD)
+            stdscr.addstr(1, 0, "-" * (w - 1))
+
+            line_num = 2
+            for i, entry in enumerate(paginated_entries):
+                _draw_entry_result_row(stdscr, line_num + i, entry, i == selected_idx_on_page, w)
+
+            page_info = f"Page {current_page + 1}/{total_pages}"
+            stdscr.addstr(h - 3, 2, page_info)
+            stdscr.addstr(h - 2, 2, "UP/DOWN: Navigate, ENTER: View, B: Back, M: Main Menu, LEFT/RIGHT: Pages")
+            stdscr.refresh()
+            redraw = False
+        elif selected_idx_on_page != drawn_idx:
+            update_entry_results_selection(stdscr, paginated_entries, drawn_idx, selected_idx_on_page)
+        drawn_idx = selected_idx_on_page
 
-        paginated_entries = display_search_results(stdscr, results, search_term, current_page, items_per_page, selected_idx_on_page)
         key = stdscr.getch()
-
-        if key == curses.KEY_UP:
-            selected_idx_on_page = max(0, selected_idx_on_page - 1)
-        elif key == curses.KEY_DOWN:
-            if entries_on_this_page_count > 0:
-                selected_idx_on_page = min(entries_on_this_page_count - 1, selected_idx_on_page + 1)
-        elif key == curses.KEY_LEFT:
+        letter = key | 0x20
+        if key not in (_KEY_UP, _KEY_DOWN):
+            redraw = True # Only highlight moves can skip the full repaint
+
+        if key == _KEY_UP:
+            selected_idx_on_page = max(selected_idx_on_page - _count_repeats(stdscr, key), 0)
+        elif key == _KEY_DOWN:
+            selected_idx_on_page = min(selected_idx_on_page + _count_repeats(stdscr, key),
+                                       max(entries_on_this_page_count - 1, 0))
+        elif key == _KEY_LEFT:
             if current_page > 0:
                 current_page -= 1
                 selected_idx_on_page = 0
-        elif key == curses.KEY_RIGHT:
+                paged = False
+        elif key == _KEY_RIGHT:
             if current_page < total_pages - 1:
                 current_page += 1
                 selected_idx_on_page = 0
-        elif key == ord('b') or key == ord('B'):
+                paged = False
+        elif letter == _K_B:
             return None
-        elif key == ord('m') or key == ord('M'):
+        elif letter == _K_M:
             return "GOTO_MAIN"  # Return to main menu immediately
-        elif key == ord('q') or key == ord('Q'):
+        elif letter == _K_Q:
             if confirm_action(stdscr, "Quit application? (y/N):"):
                 return "QUIT_APP"
-        elif (key == curses.KEY_ENTER or key in [10, 13]) and paginated_entries:
+            redraw = False # The popup leaves the list as it was
+        elif (key in _ENTER_KEYS) and paginated_entries:
             if 0 <= selected_idx_on_page < len(paginated_entries):
-                entry_id_to_view = paginated_entries[selected_idx_on_page][0]
+                entry_id_to_view = paginated_entries[selected_idx_on_page]['id']
                 result = view_single_entry_screen(stdscr, entry_id_to_view)
                 if result == "QUIT_APP":
                     return "QUIT_APP"
                 elif result == "GOTO_MAIN":
                     return "GOTO_MAIN"
-        elif key == curses.KEY_RESIZE:
+        elif key == _KEY_RESIZE:
+            _coalesce_resize(stdscr)
             items_per_page = curses.LINES - 6
             if items_per_page <= 0:
                 items_per_page = 1
+            paged = False
 
 
-def display_search_results(stdscr, entries, search_term, current_page, items_per_page, selected_idx_on_page):
-    """Displays search results with pagination."""
-    stdscr.clear()
-    h, w = stdscr.getmaxyx()
-    stdscr.addstr(0, 0, f"Search Results for '{search_term}' ({len(entries)} found)", curses.A_BOLD)
-    stdscr.addstr(1, 0, "-" * (w - 1))
+def _draw_entry_result_row(stdscr, y, entry, selected, w):
+    """Draws one entry result row, highlighted if selected."""
+    _, formatted_time, title = entry
+    display_text = f"{formatted_time} - {title}"
+    if len(display_text) > w - 4:
+        display_text = display_text[:w - 7] + "..."
 
-    start_index = current_page * items_per_page
-    end_index = start_index + items_per_page
-    paginated_entries = entries[start_index:end_index]
-
-    line_num = 2
-    for i, entry in enumerate(paginated_entries):
-        display_text = f"{entry[1]} - {entry[2]}"
-        if len(display_text) > w - 4:
-            display_text = display_text[:w - 7] + "..."
-
-        if i == selected_idx_on_page:
-            stdscr.attron(curses.color_pair(1))
-            stdscr.addstr(line_num + i, 2, f"> {display_text}")
-            stdscr.attroff(curses.color_pair(1))
-        else:
-            stdscr.addstr(line_num + i, 2, f"  {display_text}")
+    if selected:
+        stdscr.attron(_SELECTED_ATTR)
+        stdscr.addstr(y, 2, f"> {display_text}")
+        stdscr.attroff(_SELECTED_ATTR)
+    else:
+        stdscr.addstr(y, 2, f"  {display_text}")
 
-    total_pages = (len(entries) + items_per_page - 1) // items_per_page
-    if total_pages == 0:
-        total_pages = 1
-    page_info = f"Page {current_page + 1}/{total_pages}"
-    stdscr.addstr(h - 3, 2, page_info)
-    stdscr.addstr(h - 2, 2, "UP/DOWN: Navigate, ENTER: View, B: Back, M: Main Menu, LEFT/RIGHT: Pages")
+def update_entry_results_selection(stdscr, paginated_entries, old_idx, new_idx):
+    """Moves the results highlight by redrawing only the two affected rows."""
+    w = stdscr.getmaxyx()[1]
+    _draw_entry_result_row(stdscr, 2 + old_idx, paginated_entries[old_idx], False, w)
+    _draw_entry_result_row(stdscr, 2 + new_idx, paginated_entries[new_idx], True, w)
     stdscr.refresh()
-    return paginated_entries
 
 
 def filter_by_tag_screen(stdscr):
@@ -1212,67 +1814,76 @@ def filter_by_tag_screen(stdscr):
     if items_per_page <= 0:
         items_per_page = 1
     selected_idx_on_page = 0
+    total_tags = len(all_tags) # The tag list is fixed for the life of this screen
+    paged = False # Cleared whenever the page or the page size changes
+    redraw = True # Set whenever the whole page must be repainted
+    drawn_idx = 0
 
     while True:
-        stdscr.clear()
-        h, w = stdscr.getmaxyx()
-        stdscr.addstr(0, 0, f"Filter by Tag ({len(all_tags)} tags)", curses.A_BOLD)
-        stdscr.addstr(1, 0, "-" * (w - 1))
-
-        total_tags = len(all_tags)
-        total_pages = (total_tags + items_per_page - 1) // items_per_page
-        if total_pages == 0:
-            total_pages = 1
-        current_page = max(0, min(current_page, total_pages - 1))
-
-        start_index = current_page * items_per_page
-        end_index = start_index + items_per_page
-        paginated_tags = all_tags[start_index:end_index]
-
-        tags_on_this_page_count = len(paginated_tags)
-        selected_idx_on_page = max(0, min(selected_idx_on_page, tags_on_this_page_count - 1 if tags_on_this_page_count > 0 else 0))
-
-        line_num = 2
-        for i, (tag_name, count) in enumerate(paginated_tags):
-            display_text = f"{tag_name} ({count} entries)"
-            if len(display_text) > w - 4:
-                display_text = display_text[:w - 7] + "..."
-
-            if i == selected_idx_on_page:
-                stdscr.attron(curses.color_pair(1))
-                stdscr.addstr(line_num + i, 2, f"> {display_text}")
-                stdscr.attroff(curses.color_pair(1))
-            else:
-                stdscr.addstr(line_num + i, 2, f"  {display_text}")
-
-        page_info = f"Page {current_page + 1}/{total_pages}"
-        stdscr.addstr(h - 3, 2, page_info)
-        stdscr.addstr(h - 2, 2, "UP/DOWN: Navigate, ENTER: View, B: Back, M: Main Menu, LEFT/RIGHT: Pages")
-        stdscr.refresh()
+        if not paged:
+            total_pages = (total_tags + items_per_page - 1) // items_per_page
+            if total_pages == 0:
+                total_pages = 1
+            current_page = max(0, min(current_page, total_pages - 1))
+
+            # Slice the page once per page change, not on every keypress
+            start_index = current_page * items_per_page
+            paginated_tags = all_tags[start_index:start_index + items_per_page]
+            tags_on_this_page_count = len(paginated_tags)
+            selected_idx_on_page = max(0, min(selected_idx_on_page, tags_on_this_page_count - 1 if tags_on_this_page_count > 0 else 0))
+            paged = True
+
+        if redraw:
+            stdscr.clear()
+            h, w = stdscr.getmaxyx()
+            stdscr.addstr(0, 0, f"Filter by Tag ({total_tags} tags)", curses.A_BOLD)
+            stdscr.addstr(1, 0, "-" * (w - 1))
+
+            line_num = 2
+            for i, tag in enumerate(paginated_tags):
+                _draw_tag_row(stdscr, line_num + i, tag, i == selected_idx_on_page, w)
+
+            page_info = f"Page {current_page + 1}/{total_pages}"
+            stdscr.addstr(h - 3, 2, page_info)
+            stdscr.addstr(h - 2, 2, "UP/DOWN: Navigate, ENTER: View, B: Back, M: Main Menu, LEFT/RIGHT: Pages")
+            stdscr.refresh()
+            redraw = False
+        elif selected_idx_on_page != drawn_idx:
+            # Repaint only the rows losing and gaining the highlight
+            _draw_tag_row(stdscr, 2 + drawn_idx, paginated_tags[drawn_idx], False, w)
+            _draw_tag_row(stdscr, 2 + selected_idx_on_page, paginated_tags[selected_idx_on_page], True, w)
+            stdscr.refresh()
+        drawn_idx = selected_idx_on_page
 
         key = stdscr.getch()
-
-        if key == curses.KEY_UP:
-            selected_idx_on_page = max(0, selected_idx_on_page - 1)
-        elif key == curses.KEY_DOWN:
-            if tags_on_this_page_count > 0:
-                selected_idx_on_page = min(tags_on_this_page_count - 1, selected_idx_on_page + 1)
-        elif key == curses.KEY_LEFT:
+        letter = key | 0x20
+        if key not in (_KEY_UP, _KEY_DOWN):
+            redraw = True # Only highlight moves can skip the full repaint
+
+        if key == _KEY_UP:
+            selected_idx_on_page = max(selected_idx_on_page - _count_repeats(stdscr, key), 0)
+        elif key == _KEY_DOWN:
+            selected_idx_on_page = min(selected_idx_on_page + _count_repeats(stdscr, key),
+                                       max(tags_on_this_page_count - 1, 0))
+        elif key == _KEY_LEFT:
             if current_page > 0:
                 current_page -= 1
                 selected_idx_on_page = 0
-        elif key == curses.KEY_RIGHT:
+                paged = False
+        elif key == _KEY_RIGHT:
             if current_page < total_pages - 1:
                 current_page += 1
                 selected_idx_on_page = 0
-        elif key == ord('b') or key == ord('B'):
+                paged = False
+        elif letter == _K_B:
             return None
-        elif key == ord('m') or key == ord('M'):
+        elif letter == _K_M:
             return "GOTO_MAIN"  # Return to main menu immediately
-        elif key == ord('q') or key == ord('Q'):
+        elif letter == _K_Q:
             if confirm_action(stdscr, "Quit application? (y/N):"):
                 return "QUIT_APP"
-        elif (key == curses.KEY_ENTER or key in [10, 13]) and paginated_tags:
+            redraw = False # The popup leaves the list as it was
+        elif (key in _ENTER_KEYS) and paginated_tags:
             if 0 <= selected_idx_on_page < len(paginated_tags):
                 selected_tag = paginated_tags[selected_idx_on_page][0]
                 entries = get_entries_by_tag(selected_tag)
@@ -1284,91 +1895,32 @@ def filter_by_tag_screen(stdscr):
                         return "GOTO_MAIN"
                 else:
                     display_message(stdscr, f"No entries found with tag '{selected_tag}'. Press any key.")
-        elif key == curses.KEY_RESIZE:
+        elif key == _KEY_RESIZE:
+            _coalesce_resize(stdscr)
             items_per_page = curses.LINES - 6
             if items_per_page <= 0:
                 items_per_page = 1
+            paged = False
 
 
-def tag_entries_loop(stdscr, entries, tag_name):
-    """Manages display and interaction with entries filtered by tag."""
-    current_page = 0
-    items_per_page = curses.LINES - 6
-    if items_per_page <= 0:
-        items_per_page = 1
-    selected_idx_on_page = 0
-
-    while True:
-        stdscr.clear()
-        h, w = stdscr.getmaxyx()
-        stdscr.addstr(0, 0, f"Entries tagged '{tag_name}' ({len(entries)} found)", curses.A_BOLD)
-        stdscr.addstr(1, 0, "-" * (w - 1))
-
-        total_entries = len(entries)
-        total_pages = (total_entries + items_per_page - 1) // items_per_page
-        if total_pages == 0:
-            total_pages = 1
-        current_page = max(0, min(current_page, total_pages - 1))
-
-        start_index = current_page * items_per_page
-        end_index = start_index + items_per_page
-        paginated_entries = entries[start_index:end_index]
-
-        entries_on_this_page_count = len(paginated_entries)
-        selected_idx_on_page = max(0, min(selected_idx_on_page, entries_on_this_page_count - 1 if entries_on_this_page_count > 0 else 0))
-
-        line_num = 2
-        for i, entry in enumerate(paginated_entries):
-            display_text = f"{entry[1]} - {entry[2]}"
-            if len(display_text) > w - 4:
-                display_text = display_text[:w - 7] + "..."
-
-            if i == selected_idx_on_page:
-                stdscr.attron(curses.color_pair(1))
-                stdscr.addstr(line_num + i, 2, f"> {display_text}")
-                stdscr.attroff(curses.color_pair(1))
-            else:
-                stdscr.addstr(line_num + i, 2, f"  {display_text}")
+def _draw_tag_row(stdscr, y, tag, selected, w):
+    """Draws one tag row with its entry count, highlighted if selected."""
+    tag_name, count = tag
+    display_text = f"{tag_name} ({count} entries)"
+    if len(display_text) > w - 4:
+        display_text = display_text[:w - 7] + "..."
 
-        page_info = f"Page {current_page + 1}/{total_pages}"
-        stdscr.addstr(h - 3, 2, page_info)
-        stdscr.addstr(h - 2, 2, "UP/DOWN: Navigate, ENTER: View, B: Back, M: Main Menu, LEFT/RIGHT: Pages")
-        stdscr.refresh()
+    if selected:
+        stdscr.attron(_SELECTED_ATTR)
+        stdscr.addstr(y, 2, f"> {display_text}")
+        stdscr.attroff(_SELECTED_ATTR)
+    else:
+        stdscr.addstr(y, 2, f"  {display_text}")
 
-        key = stdscr.getch()
 
-        if key == curses.KEY_UP:
-            selected_idx_on_page = max(0, selected_idx_on_page - 1)
-        elif key == curses.KEY_DOWN:
-            if entries_on_this_page_count > 0:
-                selected_idx_on_page = min(entries_on_this_page_count - 1, selected_idx_on_page + 1)
-        elif key == curses.KEY_LEFT:
-            if current_page > 0:
-                current_page -= 1
-                selected_idx_on_page = 0
-        elif key == curses.KEY_RIGHT:
-            if current_page < total_pages - 1:
-                current_page += 1
-                selected_idx_on_page = 0
-        elif key == ord('b') or key == ord('B'):
-            return None
-        elif key == ord('m') or key == ord('M'):
-            return "GOTO_MAIN"  # Return to main menu immediately
-        elif key == ord('q') or key == ord('Q'):
-            if confirm_action(stdscr, "Quit application? (y/N):"):
-                return "QUIT_APP"
-        elif (key == curses.KEY_ENTER or key in [10, 13]) and paginated_entries:
-            if 0 <= selected_idx_on_page < len(paginated_entries):
-                entry_id_to_view = paginated_entries[selected_idx_on_page][0]
-                result = view_single_entry_screen(stdscr, entry_id_to_view)
-                if result == "QUIT_APP":
-                    return "QUIT_APP"
-                elif result == "GOTO_MAIN":
-                    return "GOTO_MAIN"
-        elif key == curses.KEY_RESIZE:
-            items_per_page = curses.LINES - 6
-            if items_per_page <= 0:
-                items_per_page = 1
+def tag_entries_loop(stdscr, entries, tag_name):
+    """Manages display and interaction with entries filtered by tag."""
+    return entry_results_loop(stdscr, entries, f"Entries tagged '{tag_name}' ({len(entries)} found)")
 
 
 def display_help_screen(stdscr):
@@ -1418,7 +1970,7 @@ def display_help_screen(stdscr):
     for section_title, section_shortcuts in shortcuts:
         if line >= h - 3:
             break
-        stdscr.addstr(line, 2, section_title, curses.A_BOLD | curses.color_pair(3))
+        stdscr.addstr(line, 2, section_title, _HEADER_ATTR)
         line += 1
         for key, description in section_shortcuts:
             if line >= h - 3:
@@ -1432,18 +1984,35 @@ def display_help_screen(stdscr):
     stdscr.getch()
 
 
+def _shorten_middle(text, width):
+    """Cuts text to width by replacing its middle with '...', so both ends stay readable."""
+    if len(text) <= width:
+        return text
+    if width <= 3:
+        return text[len(text) - max(width, 0):] # Too narrow for '...'; keep the end
+    keep = width - 3
+    return text[:keep // 2] + "..." + text[len(text) - (keep - keep // 2):]
+
 def confirm_action(stdscr, prompt):
-    """Generic confirmation dialog."""
-    stdscr.clear() # Clear screen for the prompt
+    """
+    Generic confirmation dialog. The prompt is shown in a popup box over the
+    current screen, which is restored afterwards, so callers need not redraw.
+    """
     h, w = stdscr.getmaxyx()
-    y_pos = h // 2
-    x_pos = (w - len(prompt) - 2) // 2 # -2 for the space for input
-    stdscr.addstr(y_pos, x_pos, prompt)
-    stdscr.refresh()
+    win_w = min(len(prompt) + 6, w) # Border, padding and the space for input
+    prompt = _shorten_middle(prompt, win_w - 6) # The question is at the end; keep it visible
+    win = curses.newwin(3, win_w, max((h - 3) // 2, 0), (w - win_w) // 2)
+    win.bkgd(' ', _BACKGROUND_ATTR)
+    win.box()
+    win.addstr(1, 2, prompt)
+    win.refresh()
     curses.echo()
     # Get only one char
-    choice = stdscr.getstr(y_pos, x_pos + len(prompt), 1).decode(errors="ignore").lower()
+    choice = win.getstr(1, 2 + len(prompt), 1).decode(errors="ignore").lower()
     curses.noecho()
+    del win
+    stdscr.touchwin() # Repaint what the popup covered
+    stdscr.refresh()
     return choice == 'y'
 
 # --- Main Application Logic ---
@@ -1455,81 +2024,114 @@ def journal_entries_loop(stdscr):
     items_per_page = curses.LINES - 6 # Adjust if header/footer changes
     if items_per_page <= 0: items_per_page = 1 # Ensure at least 1
     selected_idx_on_page = 0
-    all_entries_data = []
+    dirty = True # Set whenever the page must be re-read from the database
+    redraw = True # Set whenever the whole list must be repainted
+    drawn_idx = 0
+    pad_state = None # What list_pad was built from, to skip rebuilding an unchanged page
 
     while True:
-        all_entries_data = get_all_entries_db() # Refresh data
-        total_entries = len(all_entries_data)
-        total_pages = (total_entries + items_per_page - 1) // items_per_page
-        if total_pages == 0: total_pages = 1 # Avoid page 0/0, show 1/1 for empty
-        current_page = max(0, min(current_page, total_pages - 1))
-
-        # Adjust selected_idx_on_page if it's out of bounds for the current page
-        entries_on_this_page_count = len(all_entries_data[current_page * items_per_page : (current_page + 1) * items_per_page])
-        if entries_on_this_page_count == 0 and total_entries > 0: # e.g. deleted last item on page
-            current_page = max(0, current_page -1)
-            entries_on_this_page_count = len(all_entries_data[current_page * items_per_page : (current_page + 1) * items_per_page])
-        
-        selected_idx_on_page = max(0, min(selected_idx_on_page, entries_on_this_page_count - 1 if entries_on_this_page_count > 0 else 0))
-
-        paginated_entries = display_entries_list(stdscr, all_entries_data, current_page, items_per_page, selected_idx_on_page)
+        if dirty:
+            total_entries = count_entries_db() # Refresh data
+            total_pages = (total_entries + items_per_page - 1) // items_per_page
+            if total_pages == 0: total_pages = 1 # Avoid page 0/0, show 1/1 for empty
+            current_page = max(0, min(current_page, total_pages - 1))
+
+            # Only the rows for the current page are fetched from the database
+            paginated_entries = get_entries_page_db(current_page * items_per_page, items_per_page)
+            page_tags = get_tags_for_entries_db([entry['id'] for entry in paginated_entries])
+            entries_on_this_page_count = len(paginated_entries)
+            selected_idx_on_page = max(0, min(selected_idx_on_page, entries_on_this_page_count - 1))
+            w = stdscr.getmaxyx()[1]
+            state = (w, paginated_entries, page_tags)
+            if state != pad_state:
+                _row_cache.clear() # Titles or tags may have changed
+                list_pad = build_entries_pad(paginated_entries, page_tags, selected_idx_on_page, w)
+                pad_state = state
+            elif selected_idx_on_page != drawn_idx:
+                # Same rows as before, so only the highlight moves within the pad
+                for idx in (drawn_idx, selected_idx_on_page):
+                    entry = paginated_entries[idx]
+                    _draw_entry_row(list_pad, idx, entry, page_tags.get(entry['id']), idx == selected_idx_on_page, w)
+            drawn_idx = selected_idx_on_page
+            dirty = False
+            redraw = True
+            prefetch = True
+
+        if redraw:
+            display_entries_list(stdscr, list_pad, entries_on_this_page_count, total_entries, current_page, items_per_page)
+            redraw = False
+        elif selected_idx_on_page != drawn_idx:
+            update_entries_selection(stdscr, list_pad, paginated_entries, page_tags, drawn_idx, selected_idx_on_page)
+        drawn_idx = selected_idx_on_page
+        if prefetch:
+            # The page is already on screen; warm the page cache for LEFT/RIGHT
+            # while the user reads it
+            for page in (current_page + 1, current_page - 1):
+                if 0 <= page < total_pages:
+                    get_entries_page_db(page * items_per_page, items_per_page)
+            prefetch = False
         key = stdscr.getch()
-
-        if key == curses.KEY_UP:
-            selected_idx_on_page = max(0, selected_idx_on_page - 1)
-        elif key == curses.KEY_DOWN:
-            if entries_on_this_page_count > 0:
-                 selected_idx_on_page = min(entries_on_this_page_count - 1, selected_idx_on_page + 1)
-        elif key == curses.KEY_LEFT:
+        letter = key | 0x20
+        if key not in (_KEY_UP, _KEY_DOWN):
+            redraw = True # Only highlight moves can skip the full repaint
+
+        if key == _KEY_UP:
+            selected_idx_on_page = max(selected_idx_on_page - _count_repeats(stdscr, key), 0)
+        elif key == _KEY_DOWN:
+            selected_idx_on_page = min(selected_idx_on_page + _count_repeats(stdscr, key),
+                                       max(entries_on_this_page_count - 1, 0))
+        elif key == _KEY_LEFT:
             if current_page > 0:
                 current_page -= 1
                 selected_idx_on_page = 0 # Reset selection on page change
-        elif key == curses.KEY_RIGHT:
+                dirty = True
+        elif key == _KEY_RIGHT:
             if current_page < total_pages - 1:
                 current_page += 1
                 selected_idx_on_page = 0 # Reset selection
-        elif key == ord('n') or key == ord('N'):
+                dirty = True
+        elif letter == _K_N:
             add_new_entry_screen(stdscr)
-            # Data will be refreshed at the start of the loop
-        elif key == ord('b') or key == ord('B'):
+            dirty = True
+        elif letter == _K_B:
             return # Go back to main menu
-        elif key == ord('m') or key == ord('M'):
+        elif letter == _K_M:
             return "GOTO_MAIN"  # Return to main menu immediately
-        elif key == ord('q') or key == ord('Q'):
+        elif letter == _K_Q:
             if confirm_action(stdscr, "Quit application? (y/N):"):
                 return "QUIT_APP" # Signal to exit the whole app
-        elif key == ord('?'):
+        elif key == _K_HELP:
             display_help_screen(stdscr)
-        elif key == ord('t') or key == ord('T'):
+        elif letter == _K_T:
             toggle_theme(stdscr)
-        elif key == ord('/'):
+        elif key == _K_SEARCH:
             result = search_entries_screen(stdscr)
             if result == "QUIT_APP":
                 return "QUIT_APP"
-        elif (key == curses.KEY_ENTER or key in [10, 13]) and paginated_entries:
+            dirty = True # Entries may have been edited from the results
+        elif (key in _ENTER_KEYS) and paginated_entries:
             # Make sure there's an entry to select
             if 0 <= selected_idx_on_page < len(paginated_entries):
-                entry_id_to_view = paginated_entries[selected_idx_on_page][0] # Get ID
+                entry_id_to_view = paginated_entries[selected_idx_on_page]['id'] # Get ID
                 result = view_single_entry_screen(stdscr, entry_id_to_view)
                 if result == "QUIT_APP": return "QUIT_APP" # Propagate quit signal
-        elif (key == ord('d') or key == ord('D')) and paginated_entries:
+                dirty = True # The entry may have been edited
+        elif (letter == _K_D) and paginated_entries:
             if 0 <= selected_idx_on_page < len(paginated_entries):
-                entry_to_delete = paginated_entries[selected_idx_on_page]
-                entry_id_to_delete = entry_to_delete[0]
-                entry_title_to_delete = entry_to_delete[2]
+                entry_id_to_delete, _, entry_title_to_delete = paginated_entries[selected_idx_on_page]
                 if confirm_action(stdscr, f"Delete '{entry_title_to_delete}'? (y/N):"):
                     if delete_entry_db(entry_id_to_delete):
+                        # The reload clamps the selection, which only moves up if the
+                        # deleted row was the last one left on the page
+                        dirty = True
                         display_message(stdscr, "Entry deleted. Press any key.", clear_first=True)
-                        # Adjust selection if possible
-                        if selected_idx_on_page >= len(paginated_entries) -1 and selected_idx_on_page > 0:
-                             selected_idx_on_page -=1
                     else:
                         display_message(stdscr, "Failed to delete entry. Press any key.", clear_first=True)
-                # Data will be reloaded at the start of the loop
-        elif key == curses.KEY_RESIZE:
+        elif key == _KEY_RESIZE:
+            _coalesce_resize(stdscr)
             items_per_page = curses.LINES - 6 # Recalculate on resize
             if items_per_page <= 0: items_per_page = 1
-            # Screen will be redrawn by the loop
+            dirty = True # Page boundaries moved; the reload also drops cached rows
 
 def main_tui_loop(stdscr):
     """Main function to run the TUI."""
@@ -1539,27 +2141,38 @@ def main_tui_loop(stdscr):
     # Initialize color pairs
     init_colors()
     # Apply background color
-    stdscr.bkgd(' ', curses.color_pair(6))
+    stdscr.bkgd(' ', _BACKGROUND_ATTR)
 
     current_main_menu_option = 0
-    main_menu_options_count = 5 # "View Entries", "Add New Entry", "Search Entries", "Filter by Tag", "Exit"
+    main_menu_options_count = len(_MENU_OPTIONS)
+    redraw = True # Set whenever the whole menu must be repainted
+    drawn_option = 0
 
     while True:
-        display_main_menu(stdscr, current_main_menu_option)
+        if redraw:
+            display_main_menu(stdscr, current_main_menu_option)
+            redraw = False
+        elif current_main_menu_option != drawn_option:
+            update_main_menu_selection(stdscr, drawn_option, current_main_menu_option)
+        drawn_option = current_main_menu_option
         key = stdscr.getch()
+        letter = key | 0x20
+        if key not in (_KEY_UP, _KEY_DOWN):
+            redraw = True # Only highlight moves can skip the full repaint
 
-        if key == curses.KEY_UP:
+        if key == _KEY_UP:
             current_main_menu_option = (current_main_menu_option - 1) % main_menu_options_count
-        elif key == curses.KEY_DOWN:
+        elif key == _KEY_DOWN:
             current_main_menu_option = (current_main_menu_option + 1) % main_menu_options_count
-        elif key == ord('q') or key == ord('Q'):
+        elif letter == _K_Q:
              if confirm_action(stdscr, "Quit application? (y/N):"):
                 break
-        elif key == ord('?'):
+             redraw = False # The popup leaves the menu as it was
+        elif key == _K_HELP:
             display_help_screen(stdscr)
-        elif key == ord('t') or key == ord('T'):
+        elif letter == _K_T:
             toggle_theme(stdscr)
-        elif key == curses.KEY_ENTER or key in [10, 13]: # 10 is LF, 13 is CR
+        elif key in _ENTER_KEYS: # 10 is LF, 13 is CR
             if current_main_menu_option == 0: # View Entries
                 result = journal_entries_loop(stdscr)
                 if result == "QUIT_APP": break
@@ -1577,19 +2190,21 @@ def main_tui_loop(stdscr):
             elif current_main_menu_option == 4: # Exit
                 if confirm_action(stdscr, "Are you sure you want to exit? (y/N):"):
                     break
-        elif key == curses.KEY_RESIZE:
+                redraw = False # The popup leaves the menu as it was
+        elif key == _KEY_RESIZE:
+            _coalesce_resize(stdscr)
             # The main menu will redraw itself correctly.
             # If inside a sub-loop like journal_entries_loop, that loop needs its own resize handling.
-            pass
+        else:
+            redraw = False # Unbound keys change nothing on screen
 
 
 def quick_add_entry(title, content, tags=None):
     """Add an entry from command line without TUI."""
-    entry_id = add_entry_db(title, content)
+    tag_list = [t.strip() for t in tags.split(',') if t.strip()] if tags else []
+    entry_id = add_entry_db(title, content, tag_list)
     if entry_id:
-        if tags:
-            tag_list = [t.strip() for t in tags.split(',') if t.strip()]
-            set_entry_tags(entry_id, tag_list)
+        if tag_list:
             print(f"Entry added: '{title}' with tags: {', '.join(tag_list)}")
         else:
             print(f"Entry added: '{title}'")
@@ -1601,35 +2216,28 @@ def quick_add_entry(title, content, tags=None):
 
 def export_entries_to_markdown(output_file):
     """Export all entries to a markdown file."""
-    entries = get_all_entries_db()
-
-    if not entries:
+    if not count_entries_db():
         print("No entries to export.")
         return False
 
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write("# Journal Entries\n\n")
-        f.write(f"Exported: {datetime.now().strftime('%Y-%m-%d %H:%M')}\n\n")
-        f.write("---\n\n")
-
-        for entry_summary in entries:
-            entry_id = entry_summary[0]
-            entry = get_entry_db(entry_id)
-            if entry:
-                # entry format: (id, formatted_time, title, content)
-                title = entry[2]
-                date = entry[1]
-                content = entry[3]
-                tags = get_entry_tags(entry_id)
-
-                f.write(f"## {title}\n\n")
-                f.write(f"**Date:** {date}\n\n")
-                if tags:
-                    f.write(f"**Tags:** {', '.join(tags)}\n\n")
-                f.write(f"{content}\n\n")
-                f.write("---\n\n")
-
-    print(f"Exported {len(entries)} entries to '{output_file}'")
+    exported = 0
+    # A large buffer turns the many small per-entry writes into few syscalls
+    with open(output_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+        f.write("# Journal Entries\n\n"
+                f"Exported: {datetime.now().strftime('%Y-%m-%d %H:%M')}\n\n"
+                "---\n\n")
+
+        for entry, tags in iter_entries_with_tags_db():
+            title = entry['title']
+            date = entry['formatted_time']
+            content = entry['content']
+            tags_line = f"**Tags:** {', '.join(tags)}\n\n" if tags else ""
+
+            # One write per entry instead of one per line
+            f.write(f"## {title}\n\n**Date:** {date}\n\n{tags_line}{content}\n\n---\n\n")
+            exported += 1
+
+    print(f"Exported {exported} entries to '{output_file}'")
     return True
 
 
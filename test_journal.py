@@ -1,6 +1,8 @@
 import unittest
+from unittest import mock
 import os
 import sqlite3
+import curses
 import journal
 
 TEST_DB = 'test_journal.db'
@@ -22,6 +24,7 @@ class TestJournalDatabase(unittest.TestCase):
 
     def tearDown(self):
         """Clean up test database after each test."""
+        journal.close_db()
         if os.path.exists(TEST_DB):
             os.remove(TEST_DB)
 
@@ -35,6 +38,51 @@ class TestJournalDatabase(unittest.TestCase):
         self.assertIsNotNone(result)
         self.assertEqual(result[0], 'entries')
 
+    def test_init_db_creates_timestamp_index(self):
+        """Test that the list query is served by the timestamp index."""
+        cursor = journal._get_conn().cursor()
+        cursor.execute("EXPLAIN QUERY PLAN " + journal._SQL_SELECT_ALL)
+        plan = " ".join(row[3] for row in cursor.fetchall())
+        self.assertIn("COVERING INDEX idx_entries_list", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_page_query_uses_timestamp_index(self):
+        """Test that a page is read from the timestamp index without a sort."""
+        cursor = journal._get_conn().cursor()
+        cursor.execute("EXPLAIN QUERY PLAN " + journal._SQL_SELECT_PAGE, (10, 20))
+        plan = " ".join(row[3] for row in cursor.fetchall())
+        self.assertIn("COVERING INDEX idx_entries_list", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_init_db_backfills_formatted_time(self):
+        """Test that init_db adds and fills formatted_time for an older database."""
+        journal.close_db()
+        os.remove(TEST_DB)
+        conn = sqlite3.connect(TEST_DB)
+        conn.execute("CREATE TABLE entries (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                     "timestamp DATETIME DEFAULT CURRENT_TIMESTAMP, title TEXT NOT NULL, content TEXT NOT NULL)")
+        conn.execute("INSERT INTO entries (timestamp, title, content) VALUES ('2024-03-05 14:30:59', 'Old', 'Body')")
+        conn.commit()
+        conn.close()
+
+        journal.init_db()
+        entries = journal.get_all_entries_db()
+        self.assertEqual(entries[0][1], "2024-03-05 14:30")
+        self.assertEqual(len(journal.search_entries_db("body")), 1)
+
+    def test_init_db_enables_wal(self):
+        """Test that init_db switches the database to WAL journaling."""
+        cursor = journal._get_conn().cursor()
+        cursor.execute("PRAGMA journal_mode")
+        self.assertEqual(cursor.fetchone()[0], 'wal')
+
+    def test_read_connection_is_read_only(self):
+        """Test that the read connection sees new entries but refuses writes."""
+        journal.add_entry_db("Test Title", "Test Content")
+        self.assertEqual(journal.count_entries_db(), 1)
+        with self.assertRaises(sqlite3.OperationalError):
+            journal._get_ro_conn().execute("DELETE FROM entries")
+
     def test_add_entry_db(self):
         """Test adding a new entry."""
         result = journal.add_entry_db("Test Title", "Test Content")
@@ -44,6 +92,73 @@ class TestJournalDatabase(unittest.TestCase):
         self.assertEqual(len(entries), 1)
         self.assertEqual(entries[0][2], "Test Title")
 
+    def test_add_entries_bulk_db(self):
+        """Test adding several entries in one transaction."""
+        result = journal.add_entries_bulk_db([("Entry 1", "Content 1"), ("Entry 2", "Content 2")])
+        self.assertTrue(result)
+        self.assertEqual(journal.count_entries_db(), 2)
+
+    def test_add_entries_bulk_db_with_tags(self):
+        """Test that bulk-added entries get their tags in the same batch."""
+        result = journal.add_entries_bulk_db([("Entry 1", "Content 1"), ("Entry 2", "Content 2")],
+                                             tags=[["Work", "work"], []])
+        self.assertTrue(result)
+        self.assertEqual([e[2] for e in journal.get_entries_by_tag("work")], ["Entry 1"])
+        self.assertEqual(len(journal.search_entries_db("work")), 1)
+
+    def test_cached_reads_see_other_connections(self):
+        """Test that the cached count and pages pick up entries written by another process."""
+        journal.add_entry_db("Entry 1", "Content 1")
+        self.assertEqual(journal.count_entries_db(), 1)
+        self.assertEqual(len(journal.get_entries_page_db(0, 10)), 1)
+
+        conn = sqlite3.connect(TEST_DB)
+        conn.execute("INSERT INTO entries (title, content) VALUES ('Entry 2', 'Content 2')")
+        conn.commit()
+        conn.close()
+
+        self.assertEqual(journal.count_entries_db(), 2)
+        self.assertEqual(len(journal.get_entries_page_db(0, 10)), 2)
+
+    def test_cached_entry_and_search_see_other_connections(self):
+        """Test that cached lookups and searches pick up edits made by another process."""
+        entry_id = journal.add_entry_db("Entry 1", "Original text")
+        self.assertEqual(journal.get_entry_db(entry_id)['content'], "Original text")
+        self.assertEqual(journal.get_entry_with_tags_db(entry_id)[0]['content'], "Original text")
+        self.assertEqual(len(journal.search_entries_db("Original")), 1)
+
+        conn = sqlite3.connect(TEST_DB)
+        conn.execute("UPDATE entries SET content = 'Edited text' WHERE id = ?", (entry_id,))
+        conn.commit()
+        conn.close()
+
+        self.assertEqual(journal.get_entry_db(entry_id)['content'], "Edited text")
+        self.assertEqual(journal.get_entry_with_tags_db(entry_id)[0]['content'], "Edited text")
+        self.assertEqual(len(journal.search_entries_db("Original")), 0)
+
+    def test_add_entries_bulk_db_rejects_mismatched_tags(self):
+        """Test that a tags list not matching the entries adds nothing."""
+        pairs = [("A", "a"), ("B", "b"), ("C", "c")]
+        self.assertFalse(journal.add_entries_bulk_db(pairs, tags=[["work"]]))
+        self.assertEqual(journal.count_entries_db(), 0)
+
+    def test_transaction_rolls_back_failed_commit(self):
+        """Test that a COMMIT that fails doesn't leave the connection inside the transaction."""
+        conn = journal._get_conn()
+        conn.execute("CREATE TEMP TABLE parent (id INTEGER PRIMARY KEY)")
+        conn.execute("CREATE TEMP TABLE child (parent_id REFERENCES parent(id) DEFERRABLE INITIALLY DEFERRED)")
+        with self.assertRaises(sqlite3.IntegrityError):
+            with journal._transaction() as tx:
+                tx.execute("INSERT INTO child VALUES (1)") # Only checked at COMMIT
+        self.assertFalse(conn.in_transaction)
+        self.assertIsNotNone(journal.add_entry_db("After", "Content", ["work"]))
+
+    def test_add_entries_bulk_db_rolls_back_on_error(self):
+        """Test that a failing row leaves no partial batch behind."""
+        result = journal.add_entries_bulk_db([("Entry 1", "Content 1"), (None, "Content 2")])
+        self.assertFalse(result)
+        self.assertEqual(journal.count_entries_db(), 0)
+
     def test_get_all_entries_db_empty(self):
         """Test getting entries from empty database."""
         entries = journal.get_all_entries_db()
@@ -58,6 +173,45 @@ class TestJournalDatabase(unittest.TestCase):
         entries = journal.get_all_entries_db()
         self.assertEqual(len(entries), 3)
 
+    def test_get_all_entries_db_follows_writes(self):
+        """Test that the cached entry list is refreshed after each kind of write."""
+        entry_id = journal.add_entry_db("Entry 1", "Content 1")
+        self.assertEqual(journal.get_all_entries_db()[0][2], "Entry 1")
+        journal.update_entry_db(entry_id, "Renamed", "Content 1")
+        self.assertEqual(journal.get_all_entries_db()[0][2], "Renamed")
+        journal.delete_entry_db(entry_id)
+        self.assertEqual(journal.get_all_entries_db(), [])
+
+    def test_get_entries_page_db(self):
+        """Test fetching a single page of entries."""
+        for i in range(5):
+            journal.add_entry_db(f"Entry {i}", "Content")
+
+        self.assertEqual(len(journal.get_entries_page_db(0, 2)), 2)
+        self.assertEqual(len(journal.get_entries_page_db(4, 2)), 1)
+        self.assertEqual(journal.get_entries_page_db(6, 2), [])
+
+    def test_get_entries_page_db_follows_writes(self):
+        """Test that a cached page is refetched after an entry is added."""
+        journal.add_entry_db("Entry 1", "Content")
+        self.assertEqual(len(journal.get_entries_page_db(0, 2)), 1)
+        journal.add_entry_db("Entry 2", "Content")
+        self.assertEqual(len(journal.get_entries_page_db(0, 2)), 2)
+
+    def test_count_entries_db(self):
+        """Test counting entries."""
+        self.assertEqual(journal.count_entries_db(), 0)
+        journal.add_entry_db("Entry 1", "Content 1")
+        journal.add_entry_db("Entry 2", "Content 2")
+        self.assertEqual(journal.count_entries_db(), 2)
+
+    def test_count_entries_db_follows_delete(self):
+        """Test that the cached count is refreshed after a delete."""
+        entry_id = journal.add_entry_db("Entry 1", "Content 1")
+        self.assertEqual(journal.count_entries_db(), 1)
+        journal.delete_entry_db(entry_id)
+        self.assertEqual(journal.count_entries_db(), 0)
+
     def test_get_entry_db(self):
         """Test getting a specific entry by ID."""
         journal.add_entry_db("Test Title", "Test Content")
@@ -69,11 +223,29 @@ class TestJournalDatabase(unittest.TestCase):
         self.assertEqual(entry[2], "Test Title")
         self.assertEqual(entry[3], "Test Content")
 
+    def test_get_entry_db_by_column_name(self):
+        """Test that entry columns can be read by name."""
+        entry_id = journal.add_entry_db("Test Title", "Test Content")
+        entry = journal.get_entry_db(entry_id)
+        self.assertEqual(entry['id'], entry_id)
+        self.assertEqual(entry['title'], "Test Title")
+        self.assertEqual(entry['content'], "Test Content")
+
     def test_get_entry_db_not_found(self):
         """Test getting a non-existent entry."""
         entry = journal.get_entry_db(999)
         self.assertIsNone(entry)
 
+    def test_get_entry_db_sees_updates(self):
+        """Test that a cached entry is refreshed after it is updated."""
+        entry_id = journal.add_entry_db("Test Title", "Test Content")
+        self.assertEqual(journal.get_entry_db(entry_id)[2], "Test Title")
+
+        self.assertTrue(journal.update_entry_db(entry_id, "New Title", "New Content"))
+        entry = journal.get_entry_db(entry_id)
+        self.assertEqual(entry[2], "New Title")
+        self.assertEqual(entry[3], "New Content")
+
     def test_delete_entry_db(self):
         """Test deleting an entry."""
         journal.add_entry_db("Test Title", "Test Content")
@@ -118,6 +290,68 @@ class TestJournalDatabase(unittest.TestCase):
         self.assertEqual(len(results_lower), 1)
         self.assertEqual(len(results_upper), 1)
 
+    def test_search_entries_db_prefix(self):
+        """Test that a search term matches the start of a word."""
+        journal.add_entry_db("Entry 1", "Programming notes")
+
+        results = journal.search_entries_db("program")
+        self.assertEqual(len(results), 1)
+
+    @unittest.skipUnless(journal._FTS_TRIGRAM, "SQLite lacks the trigram tokenizer")
+    def test_search_entries_db_substring(self):
+        """Test that a search term matches inside a word, like a plain substring search."""
+        journal.add_entry_db("Entry 1", "Programming notes")
+        journal.add_entry_db("Entry 2", "Other")
+
+        self.assertEqual(len(journal.search_entries_db("gramm")), 1)
+        self.assertEqual(len(journal.search_entries_db("ng no")), 1)
+
+    @unittest.skipUnless(journal._FTS_TRIGRAM, "SQLite lacks the trigram tokenizer")
+    def test_init_db_rebuilds_word_index_as_trigram(self):
+        """Test that an index built with the old word tokenizer is rebuilt."""
+        journal.close_db()
+        conn = sqlite3.connect(TEST_DB)
+        conn.execute("DROP TABLE entries_fts")
+        conn.execute('''
+            CREATE VIRTUAL TABLE entries_fts USING fts5(
+                title, content, content='entries', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+        ''')
+        conn.execute("INSERT INTO entries (title, content) VALUES ('Old', 'Programming notes')")
+        conn.execute("INSERT INTO entries_fts(entries_fts) VALUES ('rebuild')")
+        conn.commit()
+        conn.close()
+
+        journal.init_db()
+        self.assertEqual(len(journal.search_entries_db("gramm")), 1)
+
+    def test_search_entries_db_by_tag(self):
+        """Test searching entries by tag name."""
+        entry_id = journal.add_entry_db("Entry 1", "Content")
+        journal.add_entry_db("Entry 2", "Content")
+        journal.set_entry_tags(entry_id, ["travel"])
+
+        results = journal.search_entries_db("trav")
+        self.assertEqual([row[0] for row in results], [entry_id])
+
+    def test_search_entries_db_follows_updates(self):
+        """Test that the search index tracks edits and deletes."""
+        entry_id = journal.add_entry_db("Entry 1", "Old words")
+        journal.update_entry_db(entry_id, "Entry 1", "New words")
+        self.assertEqual(journal.search_entries_db("old"), [])
+        self.assertEqual(len(journal.search_entries_db("new")), 1)
+
+        journal.delete_entry_db(entry_id)
+        self.assertEqual(journal.search_entries_db("new"), [])
+
+    def test_search_entries_db_quotes_term(self):
+        """Test that punctuation and quotes in the term don't raise."""
+        journal.add_entry_db("Entry 1", 'She said "hi" - then left')
+
+        self.assertEqual(len(journal.search_entries_db('"hi"')), 1)
+        self.assertEqual(len(journal.search_entries_db("-")), 1)
+
     def test_search_entries_db_no_results(self):
         """Test search with no matching results."""
         journal.add_entry_db("Test Entry", "Test Content")
@@ -156,6 +390,7 @@ class TestTagFunctionality(unittest.TestCase):
 
     def tearDown(self):
         """Clean up test database after each test."""
+        journal.close_db()
         if os.path.exists(TEST_DB):
             os.remove(TEST_DB)
 
@@ -215,6 +450,55 @@ class TestTagFunctionality(unittest.TestCase):
         tags = journal.get_entry_tags(entry_id)
         self.assertEqual(tags, [])
 
+    def test_get_entry_with_tags_db(self):
+        """Test fetching an entry together with its sorted tags."""
+        entry_id = journal.add_entry_db("Test", "Content")
+        entry, tags = journal.get_entry_with_tags_db(entry_id)
+        self.assertEqual(entry['content'], "Content")
+        self.assertEqual(tags, [])
+
+        journal.set_entry_tags(entry_id, ["work", "ideas"])
+        entry, tags = journal.get_entry_with_tags_db(entry_id)
+        self.assertEqual(tags, ["ideas", "work"])
+        self.assertEqual(journal.get_entry_with_tags_db(999), (None, []))
+
+    def test_add_entry_db_with_tags(self):
+        """Test adding an entry and its tags together."""
+        entry_id = journal.add_entry_db("Test", "Content", ["Work", "ideas", "work"])
+        self.assertIsNotNone(entry_id)
+        self.assertEqual(journal.get_entry_tags(entry_id), ["ideas", "work"])
+        self.assertEqual(journal.count_entries_db(), 1)
+
+    def test_export_entries_to_markdown(self):
+        """Test exporting entries with their tags in one pass."""
+        journal.add_entry_db("Untagged", "Plain body")
+        entry_id = journal.add_entry_db("Tagged", "Tagged body")
+        journal.set_entry_tags(entry_id, ["work", "ideas"])
+        output_file = 'test_export.md'
+        try:
+            self.assertTrue(journal.export_entries_to_markdown(output_file))
+            with open(output_file, encoding='utf-8') as f:
+                exported = f.read()
+        finally:
+            if os.path.exists(output_file):
+                os.remove(output_file)
+
+        self.assertEqual(exported.count("## "), 2)
+        self.assertIn("## Tagged\n\n", exported)
+        self.assertIn("**Tags:** ideas, work\n\n", exported)
+        self.assertIn("Plain body\n\n---\n\n", exported)
+        self.assertEqual(exported.count("**Tags:**"), 1)
+
+    def test_get_tags_for_entries_db(self):
+        """Test fetching the tags of several entries at once."""
+        entry1 = journal.add_entry_db("Entry 1", "Content")
+        entry2 = journal.add_entry_db("Entry 2", "Content")
+        journal.set_entry_tags(entry1, ["work", "ideas"])
+
+        tags = journal.get_tags_for_entries_db([entry1, entry2])
+        self.assertEqual(tags, {entry1: ["ideas", "work"], entry2: []})
+        self.assertEqual(journal.get_tags_for_entries_db([]), {})
+
     def test_set_entry_tags_replaces_existing(self):
         """Test that setting tags replaces existing tags."""
         entry_id = journal.add_entry_db("Test", "Content")
@@ -235,6 +519,13 @@ class TestTagFunctionality(unittest.TestCase):
         tags = journal.get_entry_tags(entry_id)
         self.assertEqual(tags, [])
 
+    def test_set_entry_tags_dedupes(self):
+        """Test that repeated and blank tag names collapse to one link each."""
+        entry_id = journal.add_entry_db("Test", "Content")
+        self.assertTrue(journal.set_entry_tags(entry_id, ["Work", " work ", "", "ideas"]))
+
+        self.assertEqual(journal.get_entry_tags(entry_id), ["ideas", "work"])
+
     def test_get_all_tags(self):
         """Test getting all tags with counts."""
         entry1 = journal.add_entry_db("Entry 1", "Content")
@@ -250,6 +541,24 @@ class TestTagFunctionality(unittest.TestCase):
         self.assertEqual(tag_dict["ideas"], 1)
         self.assertEqual(tag_dict["personal"], 1)
 
+    def test_search_follows_tag_changes(self):
+        """Test that a cached search is refreshed when an entry's tags change."""
+        entry_id = journal.add_entry_db("Title", "Content")
+        self.assertEqual(journal.search_entries_db("holiday"), [])
+        journal.set_entry_tags(entry_id, ["holiday"])
+        self.assertEqual(len(journal.search_entries_db("holiday")), 1)
+
+    def test_delete_entry_removes_tag_links(self):
+        """Test that deleting an entry drops it from the tag counts."""
+        entry1 = journal.add_entry_db("Entry 1", "Content")
+        entry2 = journal.add_entry_db("Entry 2", "Content")
+        journal.set_entry_tags(entry1, ["work"])
+        journal.set_entry_tags(entry2, ["work"])
+
+        self.assertTrue(journal.delete_entry_db(entry1))
+        tag_dict = {name: count for name, count in journal.get_all_tags()}
+        self.assertEqual(tag_dict["work"], 1)
+
     def test_get_all_tags_empty(self):
         """Test getting all tags when none exist."""
         all_tags = journal.get_all_tags()
@@ -287,6 +596,52 @@ class TestTagFunctionality(unittest.TestCase):
         entries = journal.get_entries_by_tag("nonexistent")
         self.assertEqual(entries, [])
 
+    def test_init_db_migrates_tags_to_nocase(self):
+        """Test that an older tags table is rebuilt without losing tag links."""
+        entry_id = journal.add_entry_db("Test", "Content")
+        journal.close_db()
+        conn = sqlite3.connect(TEST_DB)
+        conn.execute("DROP TABLE tags")
+        conn.execute("CREATE TABLE tags (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL UNIQUE)")
+        conn.execute("INSERT INTO tags (id, name) VALUES (7, 'work')")
+        conn.execute("INSERT INTO entry_tags (entry_id, tag_id) VALUES (?, 7)", (entry_id,))
+        conn.commit()
+        conn.close()
+
+        journal.init_db()
+        self.assertEqual(journal.get_entry_tags(entry_id), ["work"])
+        self.assertEqual(len(journal.get_entries_by_tag("WORK")), 1)
+        self.assertEqual(journal.get_or_create_tag("Work"), 7)
+
+    def test_init_db_migration_merges_case_duplicate_tags(self):
+        """Test that tags differing only by case are merged with their links kept."""
+        first_id = journal.add_entry_db("First", "Content")
+        second_id = journal.add_entry_db("Second", "Content")
+        journal.close_db()
+        conn = sqlite3.connect(TEST_DB)
+        conn.execute("DROP TABLE tags")
+        conn.execute("CREATE TABLE tags (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL UNIQUE)")
+        conn.execute("INSERT INTO tags (id, name) VALUES (7, 'work'), (9, 'Work')")
+        conn.executemany("INSERT INTO entry_tags (entry_id, tag_id) VALUES (?, ?)",
+                         [(first_id, 9), (second_id, 7), (second_id, 9)])
+        conn.commit()
+        conn.close()
+
+        journal.init_db()
+        self.assertEqual(journal.get_entry_tags(first_id), ["work"])
+        self.assertEqual(journal.get_entry_tags(second_id), ["work"])
+        self.assertEqual(len(journal.get_entries_by_tag("work")), 2)
+        cursor = journal._get_conn().cursor()
+        cursor.execute("SELECT COUNT(*) FROM entry_tags WHERE tag_id NOT IN (SELECT id FROM tags)")
+        self.assertEqual(cursor.fetchone()[0], 0)
+
+    def test_tag_query_uses_tag_index(self):
+        """Test that filtering by tag looks up links through the tag index."""
+        cursor = journal._get_conn().cursor()
+        cursor.execute("EXPLAIN QUERY PLAN " + journal._SQL_ENTRIES_BY_TAG, ("work",))
+        plan = " ".join(row[3] for row in cursor.fetchall())
+        self.assertIn("idx_entry_tags_tag", plan)
+
 
 class TestWordWrap(unittest.TestCase):
     """Tests for word wrapping function."""
@@ -316,11 +671,157 @@ class TestWordWrap(unittest.TestCase):
         result = journal.wrap_text("", 10)
         self.assertEqual(result, [""])
 
+    def test_wrap_keeps_inner_spaces(self):
+        """Test that runs of spaces inside a line are kept as typed."""
+        result = journal.wrap_text("a  b   c", 10)
+        self.assertEqual(result, ["a  b   c"])
+
     def test_wrap_exact_width(self):
         """Test text that exactly fits width."""
         result = journal.wrap_text("hello", 5)
         self.assertEqual(result, ["hello"])
 
+    def test_wrap_short_text_drops_leading_space(self):
+        """Test that a line that fits still loses its leading spaces, as longer lines do."""
+        self.assertEqual(journal.wrap_text("  hello", 10), ["hello"])
+
+
+_SPLIT_SAMPLES = ["", "one", "one\ntwo", "one\n", "one\n\n", "\n", "a\r\nb\rc",
+                  "a\x0bb\x0cc\nd", "a\x1cb\x1dc\x1ed", "a\x85b\n", "a\u2028b\u2029c\n"]
+
+
+class TestDisplayLines(unittest.TestCase):
+    """Tests for building the wrapped display lines of an entry."""
+
+    def test_split_content_lines_matches_splitlines(self):
+        """Test that content splits the same way as str.splitlines()."""
+        for content in _SPLIT_SAMPLES:
+            self.assertEqual(journal.split_content_lines(content), content.splitlines())
+
+    def test_iter_content_lines_matches_splitlines(self):
+        """Test that lazily split content yields the same lines as str.splitlines()."""
+        for content in _SPLIT_SAMPLES:
+            self.assertEqual(list(journal.iter_content_lines(content)), content.splitlines())
+
+    def test_wraps_regular_text(self):
+        """Test that regular lines are word wrapped."""
+        result = journal.build_display_lines(["hello world"], 8)
+        self.assertEqual([line[0] for line in result], ["hello", "world"])
+        self.assertEqual([line[3] for line in result], [0, 0])
+
+    def test_code_block_not_wrapped(self):
+        """Test that code block lines are flagged and left unwrapped."""
+        result = journal.build_display_lines(["```", "a long code line", "```", "text"], 6)
+        self.assertEqual(result[0], ("```", False, True, 0))
+        self.assertEqual(result[1], ("a long code line", True, False, 1))
+        self.assertEqual(result[2], ("```", False, True, 2))
+        self.assertEqual(result[3], ("text", False, False, 3))
+
+    def test_wrapped_content_is_shared(self):
+        """Test that views of the same content and width share one wrap."""
+        first = journal._wrapped_content("hello world", 8)
+        self.assertIs(journal._wrapped_content("hello world", 8), first)
+        self.assertIsNot(journal._wrapped_content("hello world", 20), first)
+
+    def test_iter_display_lines_is_lazy(self):
+        """Test that lines are only wrapped as they are consumed."""
+        lines = journal.iter_display_lines(["first", None], 10)
+        self.assertEqual(next(lines), ("first", False, False, 0))
+
+
+class TestEntryRowFormat(unittest.TestCase):
+    """Tests for formatting rows of the entries list."""
+
+    def setUp(self):
+        journal._row_cache.clear()
+
+    def test_short_row_keeps_tags_separate(self):
+        """Test that a row that fits returns the tags on their own."""
+        result = journal._format_entry_row((1, "2024-01-01 10:00", "Title"), ["work"], 80)
+        self.assertEqual(result, ("2024-01-01 10:00 - Title", " [work]"))
+
+    def test_long_row_is_truncated(self):
+        """Test that a row wider than the screen is cut with an ellipsis."""
+        row_text, tags_str = journal._format_entry_row((1, "2024-01-01 10:00", "A long title"), ["work"], 20)
+        self.assertEqual(row_text, "2024-01-01 10...")
+        self.assertEqual(tags_str, "")
+
+    def test_cache_keyed_by_width(self):
+        """Test that a cached row is rebuilt when the width changes."""
+        entry = (1, "2024-01-01 10:00", "A long title")
+        journal._format_entry_row(entry, [], 20)
+        self.assertEqual(journal._format_entry_row(entry, [], 80)[0], "2024-01-01 10:00 - A long title")
+
+
+class _FakeWindow:
+    """Stands in for a curses window on an 80-column screen, failing like ncurses off the edge."""
+
+    def __init__(self, nlines, ncols, y, x):
+        self._check(ncols, x)
+        self.ncols, self.x = ncols, x
+
+    @staticmethod
+    def _check(ncols, x):
+        if x + ncols > 80:
+            raise curses.error("window runs past the right edge")
+
+    def resize(self, nlines, ncols):
+        self.ncols = ncols
+
+    def mvwin(self, y, x):
+        self._check(self.ncols, x)
+        self.x = x
+
+    def erase(self):
+        pass
+
+
+class TestInputWindow(unittest.TestCase):
+    """Tests for the shared text input window."""
+
+    def setUp(self):
+        journal._input_win = None
+
+    def tearDown(self):
+        journal._input_win = None
+
+    def test_reused_window_stays_on_screen(self):
+        """Test that a second prompt reaching past the right edge is clamped, not an error."""
+        with mock.patch.object(curses, 'COLS', 80, create=True), \
+             mock.patch.object(journal.curses, 'newwin', _FakeWindow):
+            first = journal._get_input_win(3, 10, 71)
+            second = journal._get_input_win(5, 32, 71)
+        self.assertIs(second, first)
+        self.assertEqual((second.x, second.ncols), (32, 48))
+
+    def test_falls_back_to_new_window(self):
+        """Test that a window ncurses refuses to move is replaced by a fresh one."""
+        with mock.patch.object(curses, 'COLS', 80, create=True), \
+             mock.patch.object(journal.curses, 'newwin', _FakeWindow):
+            first = journal._get_input_win(3, 2, 78)
+            first.mvwin = mock.Mock(side_effect=curses.error)
+            second = journal._get_input_win(5, 40, 10)
+        self.assertIsNot(second, first)
+        self.assertEqual((second.x, second.ncols), (40, 10))
+
+
+class TestConfirmPrompt(unittest.TestCase):
+    """Tests for fitting confirmation prompts to the screen."""
+
+    def test_long_prompt_keeps_question(self):
+        """Test that a long prompt loses its middle, not the question at the end."""
+        prompt = f"Delete '{'x' * 100}'? (y/N):"
+        result = journal._shorten_middle(prompt, 40)
+        self.assertEqual(len(result), 40)
+        self.assertTrue(result.startswith("Delete 'x"))
+        self.assertTrue(result.endswith("'? (y/N):"))
+        self.assertIn("...", result)
+
+    def test_short_prompt_unchanged(self):
+        """Test that a prompt that fits is returned as is."""
+        self.assertEqual(journal._shorten_middle("Quit? (y/N):", 40), "Quit? (y/N):")
+        self.assertEqual(journal._shorten_middle("Quit? (y/N):", 2), "):")
+
 
 class TestMarkdownParsing(unittest.TestCase):
     """Tests for markdown regex patterns used in rendering."""
@@ -328,7 +829,7 @@ class TestMarkdownParsing(unittest.TestCase):
     def test_header_pattern(self):
         """Test header regex pattern matching."""
         import re
-        pattern = r'^(#{1,6})\s+(.*)$'
+        pattern = journal._HEADER_RE
 
         # Valid headers
         self.assertIsNotNone(re.match(pattern, '# Header 1'))
@@ -343,7 +844,7 @@ class TestMarkdownParsing(unittest.TestCase):
     def test_list_pattern(self):
         """Test list item regex pattern matching."""
         import re
-        pattern = r'^(\s*)([-*]|\d+\.)\s+(.*)$'
+        pattern = journal._LIST_RE
 
         # Valid list items
         match = re.match(pattern, '- Item')
@@ -364,37 +865,57 @@ class TestMarkdownParsing(unittest.TestCase):
     def test_inline_markdown_pattern(self):
         """Test inline markdown pattern matching."""
         import re
-        pattern = r'(\*\*(.+?)\*\*)|(`(.+?)`)|(\*(.+?)\*)|(_(.+?)_)'
+        pattern = journal._INLINE_RE
 
         # Bold
         matches = list(re.finditer(pattern, 'This is **bold** text'))
         self.assertEqual(len(matches), 1)
-        self.assertEqual(matches[0].group(2), 'bold')
+        self.assertEqual(matches[0].lastgroup, 'bold')
+        self.assertEqual(matches[0].group('bold'), 'bold')
 
         # Inline code
         matches = list(re.finditer(pattern, 'Use `code` here'))
         self.assertEqual(len(matches), 1)
-        self.assertEqual(matches[0].group(4), 'code')
+        self.assertEqual(matches[0].lastgroup, 'code')
+        self.assertEqual(matches[0].group('code'), 'code')
 
         # Italic with asterisk
         matches = list(re.finditer(pattern, 'This is *italic* text'))
         self.assertEqual(len(matches), 1)
-        self.assertEqual(matches[0].group(6), 'italic')
+        self.assertEqual(matches[0].lastgroup, 'star')
+        self.assertEqual(matches[0].group('star'), 'italic')
 
         # Italic with underscore
         matches = list(re.finditer(pattern, 'This is _italic_ text'))
         self.assertEqual(len(matches), 1)
-        self.assertEqual(matches[0].group(8), 'italic')
+        self.assertEqual(matches[0].lastgroup, 'underscore')
+        self.assertEqual(matches[0].group('underscore'), 'italic')
 
     def test_multiple_inline_elements(self):
         """Test multiple inline markdown elements in one line."""
         import re
-        pattern = r'(\*\*(.+?)\*\*)|(`(.+?)`)|(\*(.+?)\*)|(_(.+?)_)'
+        pattern = journal._INLINE_RE
 
         text = 'Here is **bold** and `code` and *italic*'
         matches = list(re.finditer(pattern, text))
         self.assertEqual(len(matches), 3)
 
+    def test_inline_markdown_runs(self):
+        """Test splitting a line into attribute runs."""
+        runs = journal.inline_markdown_runs('a **b** c', 80)
+        self.assertEqual([text for _, text in runs], ['a ', 'b', ' c'])
+        self.assertEqual(runs[1][0], curses.A_BOLD)
+
+    def test_inline_markdown_runs_cut_to_width(self):
+        """Test that runs stop at the available width."""
+        runs = journal.inline_markdown_runs('abc **defg** hij', 6)
+        self.assertEqual(''.join(text for _, text in runs), 'abc de')
+
+    def test_tokenize_markdown_list_item(self):
+        """Test that a list item becomes indent, bullet, gap and text runs."""
+        runs = journal.tokenize_markdown('  - Item', 80)
+        self.assertEqual([text for _, text in runs], ['  ', '• ', ' ', 'Item'])
+
 
 class TestNavigationSignals(unittest.TestCase):
     """Tests for navigation signal handling."""
@@ -416,5 +937,38 @@ class TestNavigationSignals(unittest.TestCase):
         self.assertTrue(result == "GOTO_MAIN")
 
 
+class TestConfig(unittest.TestCase):
+    """Tests for config file reading and writing."""
+
+    TEST_CONFIG = 'test_journalrc'
+
+    def setUp(self):
+        """Point the config helpers at a scratch file."""
+        self.saved_config_file = journal.CONFIG_FILE
+        journal.CONFIG_FILE = self.TEST_CONFIG
+        journal._CONFIG_CACHE = None
+        with open(self.TEST_CONFIG, 'w') as f:
+            f.write('# comment\nTHEME="light"\nTHEME=dark\n')
+
+    def tearDown(self):
+        """Restore the real config file path."""
+        journal.CONFIG_FILE = self.saved_config_file
+        journal._CONFIG_CACHE = None
+        if os.path.exists(self.TEST_CONFIG):
+            os.remove(self.TEST_CONFIG)
+
+    def test_set_config_value_updates_file_and_cache(self):
+        """Test that a saved value is read back and the rest of the file is kept."""
+        self.assertEqual(journal.get_config_value('THEME'), 'light')
+        self.assertIsNone(journal.get_config_value('DATABASE_PATH'))
+
+        journal.set_config_value('THEME', 'dark')
+        self.assertEqual(journal.get_config_value('THEME'), 'dark')
+        journal._CONFIG_CACHE = None
+        self.assertEqual(journal.get_config_value('THEME'), 'dark')
+        with open(self.TEST_CONFIG) as f:
+            self.assertTrue(f.read().startswith('# comment\n'))
+
+
 if __name__ == '__main__':
     unittest.main()